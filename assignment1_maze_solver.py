@@ -6,9 +6,930 @@ Problem Statement: Given a grid-based maze where 0 represents walls and 1
 represents walkable paths, find the shortest path from a start cell to an end cell.
 """
 
-from collections import deque
+from array import array
+from collections import deque, namedtuple
+import heapq
+import mmap
+import struct
 import time
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the bytearray backend always works
+    np = None
+
+DIAGONAL_COST = 2 ** 0.5
+INFINITY = float('inf')
+NO_PARENT = 255  # parent_direction value for the source and unreached cells
+
+# Binary maze file: 16-byte little-endian header followed by row-major cells,
+# either one byte per cell (bit depth 8) or packed eight per byte (bit depth 1,
+# least significant bit first).
+MAZE_MAGIC = b'MAZE'
+MAZE_VERSION = 1
+MAZE_HEADER = struct.Struct('<4sBBBxII')  # magic, version, bit depth, connectivity, rows, cols
+MazeHeader = namedtuple('MazeHeader', ['rows', 'cols', 'bit_depth', 'connectivity'])
+
+
+class CompactGrid:
+    """
+    Row-major grid stored as one byte per cell (0 = wall, 1 = walkable).
+    
+    Cells live in a single flat buffer (a bytearray, or a NumPy uint8 array
+    viewed through a memoryview) instead of a list of Python int lists.
+    Indexing by row returns a writable memoryview, so grid[row][col]
+    reads and writes work just like the list-of-lists form.
+    """
+    
+    def __init__(self, rows, cols, cells=None):
+        """
+        Args:
+            rows: Number of grid rows
+            cols: Number of grid columns
+            cells: Optional writable byte buffer of length rows * cols
+                   (defaults to an all-wall bytearray)
+        """
+        self.rows = rows
+        self.cols = cols
+        if cells is None:
+            cells = bytearray(rows * cols)
+        if len(cells) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} cells, got {len(cells)}")
+        self.cells = cells
+    
+    @classmethod
+    def from_lists(cls, maze):
+        """Convert a 2D list (0 = wall, 1 = walkable) into a compact grid."""
+        rows = len(maze)
+        cols = len(maze[0]) if maze else 0
+        cells = bytearray(rows * cols)
+        for r, row in enumerate(maze):
+            cells[r * cols:(r + 1) * cols] = bytes(row)
+        return cls(rows, cols, cells)
+    
+    @classmethod
+    def from_array(cls, grid):
+        """Wrap a 2D NumPy array as a compact grid (no copy if already uint8)."""
+        if np is None:
+            raise ImportError("from_array requires numpy. Install with: pip install numpy")
+        grid = np.ascontiguousarray(grid, dtype=np.uint8)
+        rows, cols = grid.shape
+        return cls(rows, cols, memoryview(grid).cast('B'))
+    
+    @classmethod
+    def wrap(cls, maze):
+        """Return maze as a CompactGrid, converting lists or arrays if needed."""
+        if isinstance(maze, cls):
+            return maze
+        if hasattr(maze, 'dtype'):
+            return cls.from_array(maze)
+        return cls.from_lists(maze)
+    
+    def __len__(self):
+        return self.rows
+    
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError("grid row out of range")
+        return memoryview(self.cells)[row * self.cols:(row + 1) * self.cols]
+    
+    def __iter__(self):
+        for row in range(self.rows):
+            yield self[row]
+    
+    def as_array(self):
+        """Return a (rows, cols) NumPy uint8 view sharing this grid's cells."""
+        if np is None:
+            raise ImportError("as_array requires numpy. Install with: pip install numpy")
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.rows, self.cols)
+    
+    def to_lists(self):
+        """Return the grid as a 2D list of ints."""
+        return [list(row) for row in self]
+    
+    def index(self, row, col):
+        """Flat index of (row, col)."""
+        return row * self.cols + col
+    
+    def position(self, index):
+        """(row, col) of a flat index."""
+        return divmod(index, self.cols)
+    
+    def new_parents(self):
+        """Parent array of int32 flat indices, -1 meaning "no parent"."""
+        return array('i', [-1]) * (self.rows * self.cols)
+    
+    def trace_path(self, parent, index):
+        """Follow parent indices back from index and return the (row, col) path."""
+        path = []
+        while index != -1:
+            path.append(divmod(index, self.cols))
+            index = parent[index]
+        path.reverse()
+        return path
+
+
+class BitSet:
+    """Fixed-size set of flat cell indices, packed eight to a byte."""
+    
+    __slots__ = ('bits',)
+    
+    def __init__(self, size):
+        self.bits = bytearray((size + 7) >> 3)
+    
+    def add(self, index):
+        self.bits[index >> 3] |= 1 << (index & 7)
+    
+    def discard(self, index):
+        self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+    
+    def __contains__(self, index):
+        return (self.bits[index >> 3] >> (index & 7)) & 1 == 1
+
+
+class ComponentIndex:
+    """
+    Connected-component labels for a CompactGrid (4-connected open cells).
+    
+    Built once with a flood fill; afterwards connected() answers "can start
+    ever reach end?" in O(1), so solvers can reject impossible queries
+    without flooding the reachable region. Cells must be toggled through
+    set_cell() to keep the labels up to date.
+    """
+    
+    def __init__(self, grid):
+        self.grid = grid
+        self.labels = array('i', [-1]) * (grid.rows * grid.cols)  # -1 = wall
+        self._label_parent = []  # Union-find over labels, for merges on open
+        self.component_count = 0
+        
+        cells = grid.cells
+        for index in range(len(cells)):
+            if cells[index] == 1 and self.labels[index] == -1:
+                self._flood(index, self._new_label())
+    
+    def _new_label(self):
+        self._label_parent.append(len(self._label_parent))
+        self.component_count += 1
+        return len(self._label_parent) - 1
+    
+    def _find(self, label):
+        parent = self._label_parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]  # Path halving
+            label = parent[label]
+        return label
+    
+    def _open_neighbors(self, index):
+        """Flat indices of the open 4-neighbors of a cell."""
+        cols = self.grid.cols
+        cells = self.grid.cells
+        row, col = divmod(index, cols)
+        if col + 1 < cols and cells[index + 1] == 1:
+            yield index + 1
+        if row + 1 < self.grid.rows and cells[index + cols] == 1:
+            yield index + cols
+        if col > 0 and cells[index - 1] == 1:
+            yield index - 1
+        if row > 0 and cells[index - cols] == 1:
+            yield index - cols
+    
+    def _flood(self, index, label):
+        """Label every open cell reachable from index."""
+        labels = self.labels
+        labels[index] = label
+        queue = deque([index])
+        while queue:
+            for neighbor in self._open_neighbors(queue.popleft()):
+                if labels[neighbor] != label:
+                    labels[neighbor] = label
+                    queue.append(neighbor)
+    
+    def label(self, row, col):
+        """Component label of a cell, or -1 for a wall."""
+        label = self.labels[self.grid.index(row, col)]
+        return self._find(label) if label != -1 else -1
+    
+    def connected(self, start, end):
+        """
+        Return False only when no path from start to end can exist.
+        A start on a wall is not rejected, since the searches still step off it.
+        """
+        start_index = self.grid.index(*start)
+        end_index = self.grid.index(*end)
+        if start_index == end_index:
+            return True
+        end_label = self.labels[end_index]
+        if end_label == -1:
+            return False
+        start_label = self.labels[start_index]
+        return start_label == -1 or self._find(start_label) == self._find(end_label)
+    
+    def set_cell(self, row, col, value):
+        """Toggle a cell (0 = wall, 1 = walkable) and update the labels."""
+        index = self.grid.index(row, col)
+        value = 1 if value else 0
+        if self.grid.cells[index] == value:
+            return
+        self.grid.cells[index] = value
+        if value:
+            self._open_cell(index)
+        else:
+            self._close_cell(index)
+    
+    def _open_cell(self, index):
+        """A wall became open: join it to (and merge) its neighbors' components."""
+        roots = {self._find(self.labels[n]) for n in self._open_neighbors(index)}
+        if not roots:
+            self.labels[index] = self._new_label()
+            return
+        root = roots.pop()
+        for other in roots:
+            self._label_parent[other] = root
+            self.component_count -= 1
+        self.labels[index] = root
+    
+    def _close_cell(self, index):
+        """
+        An open cell became a wall: its component may split. Run one BFS per
+        open neighbor in lockstep; searches that meet are merged, and every
+        group that runs dry before the others is a piece cut off by the
+        change and gets a new label. The last remaining group keeps the old
+        label, so the work is bounded by the size of the smaller pieces.
+        """
+        root = self._find(self.labels[index])
+        self.labels[index] = -1
+        neighbors = list(self._open_neighbors(index))
+        if not neighbors:
+            self.component_count -= 1
+            return
+        if len(neighbors) == 1:
+            return
+        
+        group = list(range(len(neighbors)))
+        
+        def find_group(i):
+            while group[i] != i:
+                i = group[i]
+            return i
+        
+        owner = {cell: i for i, cell in enumerate(neighbors)}
+        queues = [deque([cell]) for cell in neighbors]
+        live = set(range(len(neighbors)))
+        labels = self.labels
+        
+        while len({find_group(i) for i in live}) > 1:
+            for i in list(live):
+                if not queues[i]:
+                    continue
+                for neighbor in self._open_neighbors(queues[i].popleft()):
+                    if self._find(labels[neighbor]) != root:
+                        continue
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = i
+                        queues[i].append(neighbor)
+                    elif find_group(other) != find_group(i):
+                        group[find_group(other)] = find_group(i)
+            
+            # A group whose searches are all exhausted is a separate piece
+            for g in {find_group(i) for i in live}:
+                members = [i for i in live if find_group(i) == g]
+                if any(queues[i] for i in members):
+                    continue
+                if len({find_group(i) for i in live}) == 1:
+                    break
+                label = self._new_label()
+                for cell, i in owner.items():
+                    if i in members:
+                        labels[cell] = label
+                live.difference_update(members)
+
+
+class SearchTree:
+    """
+    Result of a single-source BFS: an int32 distance field (-1 = not reached)
+    and a parent tree over flat indices. Paths are read off in O(path length).
+    """
+    
+    def __init__(self, grid, source):
+        self.grid = grid
+        self.source = source
+        self.distance = array('i', [-1]) * (grid.rows * grid.cols)
+        self.parent = grid.new_parents()
+        self.settled = {}  # Target index -> nodes_explored when it was popped
+        self.nodes_explored = 0
+    
+    def distance_to(self, cell):
+        """Number of steps from the source to cell, or -1 if not reached."""
+        return self.distance[self.grid.index(*cell)]
+    
+    def path_to(self, cell):
+        """Path from the source to cell, or None if cell was not reached."""
+        index = self.grid.index(*cell)
+        if self.distance[index] == -1:
+            return None
+        return self.grid.trace_path(self.parent, index)
+
+
+class LPAStarPlanner:
+    """
+    Lifelong Planning A* (LPA*) between a fixed start and end on a grid.
+    
+    The planner keeps its g/rhs values between calls. After set_wall() or
+    clear_wall(), plan() repairs the previous solution by re-expanding only
+    the cells whose distances actually changed, instead of searching again
+    from scratch. Works on any grid MazeSolver or TreasureHunt accepts.
+    """
+    
+    def __init__(self, grid, start, end):
+        """
+        Args:
+            grid: CompactGrid, 2D list or NumPy array (0 = wall, 1 = walkable).
+                  A CompactGrid is shared, so walls set here are seen by its owner.
+            start: Tuple (row, col) for start position
+            end: Tuple (row, col) for end position
+        """
+        self.grid = CompactGrid.wrap(grid)
+        self.start = self.grid.index(*start)
+        self.end = self.grid.index(*end)
+        self.end_position = end
+        self.g = {}
+        self.rhs = {self.start: 0}
+        self.open_list = [self._key(self.start) + (self.start,)]
+    
+    def _neighbors(self, index):
+        """Open 4-neighbors of a cell (walls have no edges)."""
+        grid = self.grid
+        cols = grid.cols
+        row, col = divmod(index, cols)
+        for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < grid.rows and 0 <= new_col < cols:
+                neighbor = new_row * cols + new_col
+                if grid.cells[neighbor] == 1:
+                    yield neighbor
+    
+    def _key(self, index):
+        row, col = divmod(index, self.grid.cols)
+        best = min(self.g.get(index, INFINITY), self.rhs.get(index, INFINITY))
+        return (best + abs(row - self.end_position[0]) + abs(col - self.end_position[1]), best)
+    
+    def _update_vertex(self, index):
+        if index != self.start:
+            if self.grid.cells[index] == 1:
+                self.rhs[index] = min((self.g.get(n, INFINITY) + 1 for n in self._neighbors(index)),
+                                      default=INFINITY)
+            else:
+                self.rhs[index] = INFINITY
+        if self.g.get(index, INFINITY) != self.rhs.get(index, INFINITY):
+            # Older entries for this cell go stale and are skipped when popped
+            heapq.heappush(self.open_list, self._key(index) + (index,))
+    
+    def _top(self):
+        """Drop stale heap entries and return the current top entry, if any."""
+        open_list = self.open_list
+        while open_list:
+            k1, k2, index = open_list[0]
+            if (self.g.get(index, INFINITY) != self.rhs.get(index, INFINITY) and
+                    (k1, k2) == self._key(index)):
+                return open_list[0]
+            heapq.heappop(open_list)
+        return None
+    
+    def plan(self):
+        """
+        Bring the shortest path up to date.
+        
+        Returns:
+            Tuple (path, nodes_explored) where nodes_explored counts only the
+            cells expanded by this call
+        """
+        nodes_explored = 0
+        while True:
+            top = self._top()
+            end_key = self._key(self.end)
+            if top is None or (top[:2] >= end_key and
+                               self.rhs.get(self.end, INFINITY) == self.g.get(self.end, INFINITY)):
+                break
+            
+            index = heapq.heappop(self.open_list)[2]
+            nodes_explored += 1
+            if self.g.get(index, INFINITY) > self.rhs[index]:
+                self.g[index] = self.rhs[index]  # Overconsistent: settle
+            else:
+                self.g[index] = INFINITY  # Underconsistent: reopen
+                self._update_vertex(index)
+            for neighbor in self._neighbors(index):
+                self._update_vertex(neighbor)
+        
+        return self._extract_path(), nodes_explored
+    
+    def _extract_path(self):
+        """Walk back from end along decreasing g values."""
+        if self.g.get(self.end, INFINITY) == INFINITY:
+            return None
+        index = self.end
+        path = [self.grid.position(index)]
+        while index != self.start:
+            index = min(self._neighbors(index), key=lambda n: self.g.get(n, INFINITY))
+            path.append(self.grid.position(index))
+        path.reverse()
+        return path
+    
+    def _set_cell(self, row, col, value):
+        index = self.grid.index(row, col)
+        if self.grid.cells[index] == value:
+            return
+        self.grid.cells[index] = value
+        self._update_vertex(index)
+        for neighbor in self._neighbors(index):
+            self._update_vertex(neighbor)
+    
+    def set_wall(self, row, col):
+        """Block a cell; the next plan() repairs around it."""
+        self._set_cell(row, col, 0)
+    
+    def clear_wall(self, row, col):
+        """Open a cell; the next plan() repairs to use it if shorter."""
+        self._set_cell(row, col, 1)
+
+
+class CorridorGraph:
+    """
+    Maze graph with corridors collapsed into weighted edges.
+    
+    Nodes are junctions (3+ open neighbors), dead ends and any extra
+    endpoints, keyed by (row, col) like CityGraph keys its intersections.
+    Every run of two-neighbor corridor cells between two nodes becomes one
+    edge weighted by its length, so searches skip the corridor cells.
+    """
+    
+    def __init__(self, grid, endpoints=()):
+        """
+        Args:
+            grid: CompactGrid, 2D list or NumPy array (0 = wall, 1 = walkable)
+            endpoints: Extra cells to keep as nodes (e.g. frequent query endpoints)
+        """
+        self.grid = CompactGrid.wrap(grid)
+        self.directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # Right, Down, Left, Up
+        # Adjacency: node -> list of (neighbor, weight, corridor cells between them)
+        self.graph = {}
+        
+        rows, cols = self.grid.rows, self.grid.cols
+        for row in range(rows):
+            for col in range(cols):
+                if self.grid.cells[row * cols + col] == 1 and len(self._open_steps((row, col))) != 2:
+                    self.graph[(row, col)] = []
+        for cell in endpoints:
+            if self._is_open(cell):
+                self.graph[cell] = []
+        
+        for node in self.graph:
+            for step in self._open_steps(node):
+                edge = self._walk(node, step, self.graph)
+                if edge is not None:
+                    self.graph[node].append(edge)
+    
+    def _is_open(self, cell):
+        row, col = cell
+        return (0 <= row < self.grid.rows and 
+                0 <= col < self.grid.cols and 
+                self.grid.cells[row * self.grid.cols + col] == 1)
+    
+    def _open_steps(self, cell):
+        """Directions (dr, dc) leading from cell to an open neighbor."""
+        return [(dr, dc) for dr, dc in self.directions
+                if self._is_open((cell[0] + dr, cell[1] + dc))]
+    
+    def _walk(self, origin, step, stops, extra_stop=None):
+        """
+        Follow a corridor from origin, first moving by step, until reaching a
+        cell in stops or extra_stop. Returns (node, length, interior cells) or
+        None if the corridor loops back to origin without meeting another node.
+        """
+        interior = []
+        cell = (origin[0] + step[0], origin[1] + step[1])
+        came_from = origin
+        while cell not in stops and cell != extra_stop:
+            interior.append(cell)
+            next_cells = [(cell[0] + dr, cell[1] + dc) for dr, dc in self._open_steps(cell)]
+            next_cells = [c for c in next_cells if c != came_from]
+            if not next_cells or cell == origin:
+                return None
+            came_from, cell = cell, next_cells[0]
+        if cell == origin:
+            return None
+        return cell, len(interior) + 1, interior
+    
+    @property
+    def num_nodes(self):
+        return len(self.graph)
+    
+    def shortest_path(self, start, end):
+        """
+        Dijkstra over the compressed graph. Start and end need not be nodes:
+        cells in the middle of a corridor are attached to its two ends for
+        this query only.
+        
+        Returns:
+            Tuple (path, nodes_explored) where path is the full cell list
+            and nodes_explored counts graph nodes settled
+        """
+        if not (self._is_open(start) and self._is_open(end)):
+            return ([start], 1) if start == end else (None, 0)
+        
+        extra = {}  # Temporary edges for endpoints inside corridors
+        if end not in self.graph:
+            for step in self._open_steps(end):
+                edge = self._walk(end, step, self.graph, start)
+                if edge is not None:
+                    node, weight, interior = edge
+                    extra.setdefault(node, []).append((end, weight, interior[::-1]))
+        if start not in self.graph:
+            extra[start] = [edge for edge in
+                            (self._walk(start, step, self.graph, end)
+                             for step in self._open_steps(start))
+                            if edge is not None]
+        
+        dist = {start: 0}
+        parent = {start: None}
+        pq = [(0, start)]
+        settled = set()
+        nodes_explored = 0
+        
+        while pq:
+            d, node = heapq.heappop(pq)
+            if node in settled:
+                continue
+            settled.add(node)
+            nodes_explored += 1
+            
+            if node == end:
+                return self._expand(parent, end), nodes_explored
+            
+            for neighbor, weight, interior in self.graph.get(node, []) + extra.get(node, []):
+                new_dist = d + weight
+                if neighbor not in dist or new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    parent[neighbor] = (node, interior)
+                    heapq.heappush(pq, (new_dist, neighbor))
+        
+        return None, nodes_explored
+    
+    def _expand(self, parent, end):
+        """Rebuild the cell-by-cell path from node parents and corridor cells."""
+        path = [end]
+        node = end
+        while parent[node] is not None:
+            node, interior = parent[node]
+            path.extend(reversed(interior))
+            path.append(node)
+        path.reverse()
+        return path
+
+
+class HierarchicalPathfinder:
+    """
+    Hierarchical pathfinding (HPA*) for very large grids.
+    
+    The grid is split into square clusters. Where two neighboring clusters
+    share open border cells, entrance points are placed on both sides; the
+    distances between the entrances of each cluster are precomputed. A query
+    searches this small abstract graph and then refines only the clusters
+    along the chosen route. Paths are near-optimal rather than guaranteed
+    shortest. After cells change, rebuild only the affected cluster with
+    set_cell() or rebuild_cluster().
+    """
+    
+    ENTRANCE_SPLIT = 6  # Entrances this wide get a transition at each end
+    
+    def __init__(self, grid, cluster_size=16):
+        """
+        Args:
+            grid: CompactGrid, 2D list or NumPy array (0 = wall, 1 = walkable)
+            cluster_size: Side length of a cluster in cells
+        """
+        self.grid = CompactGrid.wrap(grid)
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-self.grid.rows // cluster_size)
+        self.cluster_cols = -(-self.grid.cols // cluster_size)
+        self._borders = {}  # (cluster, right/down neighbor) -> [(cell, cell), ...]
+        self._inter = {}    # Abstract node -> set of nodes across a border (cost 1)
+        self._intra = {}    # Cluster -> {node: {node: distance}} inside the cluster
+        
+        for cr in range(self.cluster_rows):
+            for cc in range(self.cluster_cols):
+                if cc + 1 < self.cluster_cols:
+                    self._build_border((cr, cc), (cr, cc + 1))
+                if cr + 1 < self.cluster_rows:
+                    self._build_border((cr, cc), (cr + 1, cc))
+        for cr in range(self.cluster_rows):
+            for cc in range(self.cluster_cols):
+                self._build_intra((cr, cc))
+    
+    def _cluster_of(self, index):
+        row, col = divmod(index, self.grid.cols)
+        return row // self.cluster_size, col // self.cluster_size
+    
+    def _bounds(self, cluster):
+        """(first row, end row, first col, end col) of a cluster."""
+        size = self.cluster_size
+        r0, c0 = cluster[0] * size, cluster[1] * size
+        return r0, min(r0 + size, self.grid.rows), c0, min(c0 + size, self.grid.cols)
+    
+    def _neighbor_clusters(self, cluster):
+        cr, cc = cluster
+        for nr, nc in ((cr, cc + 1), (cr + 1, cc), (cr, cc - 1), (cr - 1, cc)):
+            if 0 <= nr < self.cluster_rows and 0 <= nc < self.cluster_cols:
+                yield nr, nc
+    
+    def _build_border(self, cluster, neighbor):
+        """Place transitions on the border between cluster and its right/down neighbor."""
+        grid = self.grid
+        cols = grid.cols
+        r0, r1, c0, c1 = self._bounds(cluster)
+        if neighbor[1] > cluster[1]:
+            pairs = [(r * cols + c1 - 1, r * cols + c1) for r in range(r0, r1)]
+        else:
+            pairs = [((r1 - 1) * cols + c, r1 * cols + c) for c in range(c0, c1)]
+        
+        for a, b in self._borders.get((cluster, neighbor), []):
+            for node, other in ((a, b), (b, a)):
+                self._inter[node].discard(other)
+                if not self._inter[node]:
+                    del self._inter[node]
+        
+        transitions = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and grid.cells[a] == 1 and grid.cells[b] == 1:
+                run.append((a, b))
+                continue
+            if len(run) >= self.ENTRANCE_SPLIT:
+                transitions.extend([run[0], run[-1]])
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        
+        self._borders[(cluster, neighbor)] = transitions
+        for a, b in transitions:
+            self._inter.setdefault(a, set()).add(b)
+            self._inter.setdefault(b, set()).add(a)
+    
+    def _cluster_nodes(self, cluster):
+        """Abstract nodes (entrance cells) lying inside a cluster."""
+        nodes = set()
+        for neighbor in self._neighbor_clusters(cluster):
+            if (cluster, neighbor) in self._borders:
+                nodes.update(a for a, _ in self._borders[(cluster, neighbor)])
+            else:
+                nodes.update(b for _, b in self._borders[(neighbor, cluster)])
+        return nodes
+    
+    def _cluster_bfs(self, source, cluster, targets):
+        """
+        BFS from source restricted to one cluster, stopping once all targets
+        are reached. Returns (distance dict, parent dict, nodes_explored).
+        """
+        grid = self.grid
+        cols = grid.cols
+        r0, r1, c0, c1 = self._bounds(cluster)
+        distance = {source: 0}
+        parent = {source: -1}
+        pending = set(targets) - {source}
+        queue = deque([source])
+        nodes_explored = 0
+        
+        while queue and pending:
+            index = queue.popleft()
+            nodes_explored += 1
+            row, col = divmod(index, cols)
+            for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                new_row, new_col = row + dr, col + dc
+                if r0 <= new_row < r1 and c0 <= new_col < c1:
+                    new_index = new_row * cols + new_col
+                    if grid.cells[new_index] == 1 and new_index not in distance:
+                        distance[new_index] = distance[index] + 1
+                        parent[new_index] = index
+                        pending.discard(new_index)
+                        queue.append(new_index)
+        
+        return distance, parent, nodes_explored
+    
+    def _build_intra(self, cluster):
+        """Precompute distances between every pair of entrances in a cluster."""
+        nodes = self._cluster_nodes(cluster)
+        edges = {}
+        for node in nodes:
+            distance, _, _ = self._cluster_bfs(node, cluster, nodes)
+            edges[node] = {other: distance[other] for other in nodes
+                           if other != node and other in distance}
+        self._intra[cluster] = edges
+    
+    def rebuild_cluster(self, cluster_row, cluster_col):
+        """Recompute entrances and distances after cells inside a cluster changed."""
+        cluster = (cluster_row, cluster_col)
+        neighbors = list(self._neighbor_clusters(cluster))
+        for neighbor in neighbors:
+            if (cluster, neighbor) in self._borders:
+                self._build_border(cluster, neighbor)
+            else:
+                self._build_border(neighbor, cluster)
+        for affected in [cluster] + neighbors:
+            self._build_intra(affected)
+    
+    def set_cell(self, row, col, value):
+        """Set a cell to wall (0) or walkable (1) and rebuild its cluster."""
+        self.grid[row][col] = 1 if value else 0
+        self.rebuild_cluster(row // self.cluster_size, col // self.cluster_size)
+    
+    @property
+    def num_abstract_nodes(self):
+        return sum(len(edges) for edges in self._intra.values())
+    
+    def search(self, start, end):
+        """
+        Find a path by searching the abstract graph, then refining it.
+        
+        Args:
+            start: Tuple (row, col) for start position
+            end: Tuple (row, col) for end position
+            
+        Returns:
+            Tuple (path, abstract_nodes, refined_nodes): nodes expanded in
+            the abstract search, and cells expanded while connecting the
+            endpoints and refining the route inside clusters
+        """
+        grid = self.grid
+        start_index = grid.index(*start)
+        end_index = grid.index(*end)
+        if start_index == end_index:
+            return [start], 0, 0
+        if grid.cells[start_index] != 1 or grid.cells[end_index] != 1:
+            return None, 0, 0
+        
+        # Temporarily connect start and end to their clusters' entrances
+        start_cluster = self._cluster_of(start_index)
+        end_cluster = self._cluster_of(end_index)
+        start_targets = self._cluster_nodes(start_cluster)
+        if start_cluster == end_cluster:
+            start_targets.add(end_index)
+        distance, _, refined_nodes = self._cluster_bfs(start_index, start_cluster, start_targets)
+        extra = {start_index: {n: distance[n] for n in start_targets if n in distance}}
+        distance, _, explored = self._cluster_bfs(end_index, end_cluster, self._cluster_nodes(end_cluster))
+        refined_nodes += explored
+        for node, d in distance.items():
+            if node in self._inter or node == start_index:
+                extra.setdefault(node, {})[end_index] = d
+        
+        # A* over the abstract graph
+        end_row, end_col = end
+        g = {start_index: 0}
+        parent = {start_index: -1}
+        closed = set()
+        open_list = [(0, start_index)]
+        abstract_nodes = 0
+        
+        while open_list:
+            _, node = heapq.heappop(open_list)
+            if node in closed:
+                continue
+            closed.add(node)
+            abstract_nodes += 1
+            if node == end_index:
+                break
+            
+            neighbors = [(n, 1) for n in self._inter.get(node, ())]
+            neighbors.extend(self._intra[self._cluster_of(node)].get(node, {}).items())
+            neighbors.extend(extra.get(node, {}).items())
+            for neighbor, cost in neighbors:
+                new_g = g[node] + cost
+                if neighbor not in closed and (neighbor not in g or new_g < g[neighbor]):
+                    g[neighbor] = new_g
+                    parent[neighbor] = node
+                    row, col = divmod(neighbor, grid.cols)
+                    heapq.heappush(open_list, (new_g + abs(row - end_row) + abs(col - end_col), neighbor))
+        else:
+            return None, abstract_nodes, refined_nodes
+        
+        # Refine each abstract edge into cells
+        waypoints = []
+        node = end_index
+        while node != -1:
+            waypoints.append(node)
+            node = parent[node]
+        waypoints.reverse()
+        
+        path = [start]
+        for u, v in zip(waypoints, waypoints[1:]):
+            cluster = self._cluster_of(u)
+            if cluster != self._cluster_of(v):
+                path.append(grid.position(v))  # Border crossing
+                continue
+            _, cell_parent, explored = self._cluster_bfs(u, cluster, (v,))
+            refined_nodes += explored
+            segment = []
+            while v != u:
+                segment.append(grid.position(v))
+                v = cell_parent[v]
+            path.extend(reversed(segment))
+        
+        return path, abstract_nodes, refined_nodes
+
+
+def read_maze_header(path):
+    """Read and validate the header of a binary maze file."""
+    with open(path, 'rb') as f:
+        raw = f.read(MAZE_HEADER.size)
+    if len(raw) < MAZE_HEADER.size:
+        raise ValueError(f"{path}: file too short for a maze header")
+    magic, version, bit_depth, connectivity, rows, cols = MAZE_HEADER.unpack(raw)
+    if magic != MAZE_MAGIC or version != MAZE_VERSION:
+        raise ValueError(f"{path}: not a version {MAZE_VERSION} maze file")
+    if bit_depth not in (1, 8) or connectivity not in (4, 8):
+        raise ValueError(f"{path}: unsupported bit depth {bit_depth} or connectivity {connectivity}")
+    return MazeHeader(rows, cols, bit_depth, connectivity)
+
+
+def save_maze(path, maze, bit_depth=8, connectivity=4):
+    """
+    Write a maze to the binary maze format.
+    
+    Args:
+        path: Output file path
+        maze: 2D list, NumPy array or CompactGrid (0 = wall, 1 = walkable)
+        bit_depth: 8 for one byte per cell (memory-mapped without copying
+                   on load) or 1 for bit-packed cells (8x smaller on disk)
+        connectivity: 4 or 8, recorded for the consumer of the file
+    """
+    if bit_depth not in (1, 8) or connectivity not in (4, 8):
+        raise ValueError("bit_depth must be 1 or 8 and connectivity 4 or 8")
+    grid = CompactGrid.wrap(maze)
+    with open(path, 'wb') as f:
+        f.write(MAZE_HEADER.pack(MAZE_MAGIC, MAZE_VERSION, bit_depth, connectivity,
+                                 grid.rows, grid.cols))
+        if bit_depth == 8:
+            f.write(grid.cells)
+        elif np is not None:
+            f.write(np.packbits(np.frombuffer(grid.cells, dtype=np.uint8), bitorder='little').tobytes())
+        else:
+            cells = grid.cells
+            f.write(bytes(sum(cells[i + k] << k for k in range(min(8, len(cells) - i)))
+                          for i in range(0, len(cells), 8)))
+
+
+_UNPACKED_BYTES = [bytes((value >> k) & 1 for k in range(8)) for value in range(256)]
+
+
+def load_maze(path, mode='r'):
+    """
+    Open a binary maze file as a CompactGrid.
+    
+    Files with bit depth 8 are memory-mapped: opening is O(1) and the OS
+    pages in only the cells a search touches. Bit-packed files are read and
+    unpacked into memory once, so edits to them never reach the file.
+    
+    Args:
+        path: Maze file written by save_maze()
+        mode: 'r' read-only, 'r+' write changes back to the file (bit
+              depth 8 only), or 'c' copy-on-write (changes stay in memory)
+            
+    Returns:
+        CompactGrid
+    
+    Raises:
+        ValueError: If the cell data is truncated, or for mode 'r+' on a
+                    bit-packed file
+    """
+    header = read_maze_header(path)
+    size = header.rows * header.cols
+    access = {'r': mmap.ACCESS_READ, 'r+': mmap.ACCESS_WRITE, 'c': mmap.ACCESS_COPY}[mode]
+    start = MAZE_HEADER.size
+    
+    if header.bit_depth == 8:
+        with open(path, 'r+b' if mode == 'r+' else 'rb') as f:  # Copy-on-write only reads
+            mapped = mmap.mmap(f.fileno(), 0, access=access)
+        if len(mapped) < start + size:
+            mapped.close()
+            raise ValueError(f"{path}: truncated cell data")
+        return CompactGrid(header.rows, header.cols, memoryview(mapped)[start:start + size])
+    
+    if mode == 'r+':
+        raise ValueError(f"{path}: bit-packed mazes are unpacked into memory; "
+                         "open them with mode 'r' or 'c'")
+    with open(path, 'rb') as f:
+        f.seek(start)
+        packed = f.read((size + 7) // 8)
+    if len(packed) < (size + 7) // 8:
+        raise ValueError(f"{path}: truncated cell data")
+    if np is not None:
+        cells = bytearray(np.unpackbits(np.frombuffer(packed, dtype=np.uint8),
+                                        count=size, bitorder='little').tobytes())
+    else:
+        cells = bytearray(b''.join(map(_UNPACKED_BYTES.__getitem__, packed))[:size])
+    return CompactGrid(header.rows, header.cols, cells)
+
 
 class MazeSolver:
     def __init__(self, maze):
@@ -16,19 +937,55 @@ class MazeSolver:
         Initialize the maze solver.
         
         Args:
-            maze: 2D list where 0 = wall, 1 = walkable path
+            maze: 2D list where 0 = wall, 1 = walkable path, a 2D NumPy
+                  array, or a CompactGrid. Lists and arrays are converted
+                  into a CompactGrid (one byte per cell).
         """
         self.maze = maze
-        self.rows = len(maze)
-        self.cols = len(maze[0]) if maze else 0
+        self.components = None
         self.directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # Right, Down, Left, Up
+        self.diagonal_directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+    
+    @property
+    def maze(self):
+        return self._maze
+    
+    @maze.setter
+    def maze(self, maze):
+        self._maze = CompactGrid.wrap(maze)
+        self.rows = self._maze.rows
+        self.cols = self._maze.cols
+        self.components = None  # A new grid invalidates any component index
+    
+    def build_component_index(self):
+        """
+        Precompute connected-component labels so searches between different
+        regions return (None, 0) immediately. Use set_cell() for later edits.
+        """
+        self.components = ComponentIndex(self._maze)
+        return self.components
+    
+    def set_cell(self, row, col, value):
+        """Set a cell to wall (0) or walkable (1), keeping the component index current."""
+        if self.components is not None:
+            self.components.set_cell(row, col, value)
+        else:
+            self._maze[row][col] = 1 if value else 0
+    
+    def compress_corridors(self, endpoints=()):
+        """Build a CorridorGraph of this maze for repeated queries."""
+        return CorridorGraph(self._maze, endpoints)
+    
+    def _unreachable(self, start, end):
+        """True when the component index proves end cannot be reached from start."""
+        return self.components is not None and not self.components.connected(start, end)
         
     def is_valid(self, row, col, visited):
-        """Check if a cell is valid to visit."""
-        return (0 <= row < self.rows and 
-                0 <= col < self.cols and 
-                self.maze[row][col] == 1 and 
-                not visited[row][col])
+        """Check if a cell is valid to visit (visited is a BitSet of flat indices)."""
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        index = row * self.cols + col
+        return self._maze.cells[index] == 1 and index not in visited
     
     def bfs(self, start, end):
         """
@@ -41,41 +998,207 @@ class MazeSolver:
         Returns:
             Tuple (path, nodes_explored)
         """
-        visited = [[False] * self.cols for _ in range(self.rows)]
-        parent = [[None] * self.cols for _ in range(self.rows)]
-        queue = deque([start])
-        visited[start[0]][start[1]] = True
+        if self._unreachable(start, end):
+            return None, 0
+        
+        grid = self._maze
+        cols = self.cols
+        visited = BitSet(self.rows * cols)
+        parent = grid.new_parents()
+        start_index = grid.index(*start)
+        end_index = grid.index(*end)
+        queue = deque([start_index])
+        visited.add(start_index)
         nodes_explored = 0
         
         while queue:
-            row, col = queue.popleft()
+            index = queue.popleft()
             nodes_explored += 1
             
             # Check if we reached the end
-            if (row, col) == end:
-                # Reconstruct path
-                path = []
-                current = end
-                while current is not None:
-                    path.append(current)
-                    current = parent[current[0]][current[1]]
-                path.reverse()
-                return path, nodes_explored
+            if index == end_index:
+                return grid.trace_path(parent, index), nodes_explored
             
             # Explore neighbors
+            row, col = divmod(index, cols)
             for dr, dc in self.directions:
                 new_row, new_col = row + dr, col + dc
                 
                 if self.is_valid(new_row, new_col, visited):
-                    visited[new_row][new_col] = True
-                    parent[new_row][new_col] = (row, col)
-                    queue.append((new_row, new_col))
+                    new_index = new_row * cols + new_col
+                    visited.add(new_index)
+                    parent[new_index] = index
+                    queue.append(new_index)
         
         return None, nodes_explored  # No path found
     
+    def bfs_tree(self, source, targets=()):
+        """
+        BFS from source that keeps its distance field and parent tree.
+        
+        Args:
+            source: Tuple (row, col) to search from
+            targets: Cells to settle; the search stops once all of them have
+                     been popped. With no targets the whole region is flooded.
+            
+        Returns:
+            SearchTree
+        """
+        grid = self._maze
+        cols = self.cols
+        tree = SearchTree(grid, source)
+        distance = tree.distance
+        parent = tree.parent
+        pending = {grid.index(*target) for target in targets}
+        
+        source_index = grid.index(*source)
+        distance[source_index] = 0
+        queue = deque([source_index])
+        visited = BitSet(self.rows * cols)
+        visited.add(source_index)
+        
+        while queue:
+            index = queue.popleft()
+            tree.nodes_explored += 1
+            
+            if index in pending:
+                tree.settled[index] = tree.nodes_explored
+                pending.discard(index)
+                if not pending and targets:
+                    break
+            
+            row, col = divmod(index, cols)
+            for dr, dc in self.directions:
+                new_row, new_col = row + dr, col + dc
+                
+                if self.is_valid(new_row, new_col, visited):
+                    new_index = new_row * cols + new_col
+                    visited.add(new_index)
+                    distance[new_index] = distance[index] + 1
+                    parent[new_index] = index
+                    queue.append(new_index)
+        
+        return tree
+    
+    def distance_field(self, source):
+        """
+        Whole-grid BFS distances computed with NumPy, one level at a time.
+        
+        The frontier is an array of flat indices. Each level shifts the
+        whole frontier one cell in every direction at once and keeps the
+        open, unvisited cells it lands on, so the per-cell work happens in
+        NumPy instead of the interpreter and each level costs O(frontier).
+        
+        Args:
+            source: Tuple (row, col) to measure distances from
+            
+        Returns:
+            Tuple (distance, parent_direction): an int32 (rows, cols) array
+            of steps from source (-1 = unreachable) and a uint8 array where
+            value k means the parent is one step back along self.directions[k]
+            (NO_PARENT for the source and unreachable cells)
+        """
+        if np is None:
+            raise ImportError("distance_field requires numpy. Install with: pip install numpy")
+        rows, cols = self.rows, self.cols
+        size = rows * cols
+        unvisited = np.frombuffer(self._maze.cells, dtype=np.uint8) == 1
+        distance = np.full(size, -1, dtype=np.int32)
+        parent_direction = np.full(size, NO_PARENT, dtype=np.uint8)
+        
+        frontier = np.array([self._maze.index(*source)], dtype=np.intp)
+        unvisited[frontier] = False
+        distance[frontier] = 0
+        level = 0
+        
+        while frontier.size:
+            level += 1
+            frontier_cols = frontier % cols
+            reached = []
+            for k, (dr, dc) in enumerate(self.directions):
+                # Drop frontier cells whose step would leave the grid
+                keep = np.ones(frontier.size, dtype=bool)
+                if dc:
+                    keep &= frontier_cols != (cols - 1 if dc > 0 else 0)
+                if dr:
+                    keep &= (frontier < size - cols) if dr > 0 else (frontier >= cols)
+                
+                # A shift is one-to-one, so a direction never reaches a cell twice
+                candidates = frontier[keep] + (dr * cols + dc)
+                candidates = candidates[unvisited[candidates]]
+                unvisited[candidates] = False
+                parent_direction[candidates] = k
+                reached.append(candidates)
+            
+            frontier = np.concatenate(reached)
+            distance[frontier] = level
+        
+        return distance.reshape(rows, cols), parent_direction.reshape(rows, cols)
+    
+    def path_from_field(self, distance, parent_direction, end):
+        """Read the path to end off a distance_field() result, or None if unreachable."""
+        row, col = end
+        if distance[row, col] < 0:
+            return None
+        path = [(row, col)]
+        while parent_direction[row, col] != NO_PARENT:
+            dr, dc = self.directions[parent_direction[row, col]]
+            row, col = row - dr, col - dc
+            path.append((row, col))
+        path.reverse()
+        return path
+    
+    def batch_bfs(self, queries):
+        """
+        Answer many (start, end) queries with one BFS per distinct source.
+        
+        Queries are grouped by start, and each group shares a single search
+        tree that runs until all of its ends are settled. When there are fewer
+        distinct ends than starts (e.g. many-to-one), the searches run
+        backward from each end instead; the maze is undirected, so the
+        reversed tree path is a shortest path too.
+        
+        Args:
+            queries: List of (start, end) tuples
+            
+        Returns:
+            List of (path, nodes_explored) tuples, one per query. Forward
+            results match bfs(start, end) exactly.
+        """
+        backward = len({end for _, end in queries}) < len({start for start, _ in queries})
+        results = [None] * len(queries)
+        groups = {}
+        for i, (start, end) in enumerate(queries):
+            if backward and not (self._is_open(*start) and self._is_open(*end)):
+                # Searches may step off a wall start but never onto a wall end,
+                # so these cannot be reversed; answer them forward instead
+                results[i] = self.bfs(start, end)
+                continue
+            source, target = (end, start) if backward else (start, end)
+            groups.setdefault(source, []).append((i, target))
+        
+        for source, members in groups.items():
+            targets = [target for _, target in members
+                       if not self._unreachable(source, target)]
+            tree = self.bfs_tree(source, targets) if targets else None
+            
+            for i, target in members:
+                path = tree.path_to(target) if tree is not None else None
+                if path is None:
+                    results[i] = (None, tree.nodes_explored if tree is not None and
+                                  target in targets else 0)
+                    continue
+                if backward:
+                    path.reverse()
+                results[i] = (path, tree.settled[self._maze.index(*target)])
+        
+        return results
+    
     def dfs(self, start, end):
         """
         Depth-First Search to find a valid path (not necessarily shortest).
+        Uses an explicit stack, so path length is not limited by Python's
+        recursion depth.
         
         Args:
             start: Tuple (row, col) for start position
@@ -84,35 +1207,271 @@ class MazeSolver:
         Returns:
             Tuple (path, nodes_explored)
         """
-        visited = [[False] * self.cols for _ in range(self.rows)]
-        path = []
-        nodes_explored = [0]  # Using list to maintain reference in recursion
+        if self._unreachable(start, end):
+            return None, 0
         
-        def dfs_recursive(row, col):
-            # Mark as visited
-            visited[row][col] = True
-            nodes_explored[0] += 1
-            path.append((row, col))
+        grid = self._maze
+        cols = self.cols
+        num_directions = len(self.directions)
+        visited = BitSet(self.rows * cols)
+        
+        # Explicit stack instead of recursion: stack holds the current path as
+        # flat indices, next_direction the next neighbor to try for each entry.
+        start_index = grid.index(*start)
+        end_index = grid.index(*end)
+        stack = array('i', [start_index])
+        next_direction = bytearray(1)
+        visited.add(start_index)
+        nodes_explored = 1
+        
+        if start_index == end_index:
+            return [start], nodes_explored
+        
+        while stack:
+            direction = next_direction[-1]
+            if direction == num_directions:
+                # Backtrack
+                stack.pop()
+                next_direction.pop()
+                continue
+            next_direction[-1] = direction + 1
             
-            # Check if we reached the end
-            if (row, col) == end:
-                return True
+            row, col = divmod(stack[-1], cols)
+            dr, dc = self.directions[direction]
+            new_row, new_col = row + dr, col + dc
             
-            # Explore neighbors
-            for dr, dc in self.directions:
-                new_row, new_col = row + dr, col + dc
+            if self.is_valid(new_row, new_col, visited):
+                new_index = new_row * cols + new_col
+                visited.add(new_index)
+                nodes_explored += 1
+                stack.append(new_index)
+                next_direction.append(0)
                 
-                if self.is_valid(new_row, new_col, visited):
-                    if dfs_recursive(new_row, new_col):
-                        return True
-            
-            # Backtrack
-            path.pop()
+                # Check if we reached the end
+                if new_index == end_index:
+                    return [divmod(index, cols) for index in stack], nodes_explored
+        
+        return None, nodes_explored
+    
+    def _is_open(self, row, col):
+        """Check if a cell is inside the maze and walkable."""
+        return (0 <= row < self.rows and 
+                0 <= col < self.cols and 
+                self._maze.cells[row * self.cols + col] == 1)
+    
+    def _can_move(self, row, col, dr, dc):
+        """Check a single step; diagonal steps may not cut a wall corner."""
+        if not self._is_open(row + dr, col + dc):
             return False
+        if dr and dc:
+            return self._is_open(row + dr, col) and self._is_open(row, col + dc)
+        return True
+    
+    def _heuristic(self, row, col, end, diagonal):
+        """Manhattan distance, or octile distance when diagonal moves are allowed."""
+        dr = abs(row - end[0])
+        dc = abs(col - end[1])
+        if diagonal:
+            return max(dr, dc) + (DIAGONAL_COST - 1) * min(dr, dc)
+        return dr + dc
+    
+    def a_star(self, start, end, diagonal=False):
+        """
+        A* Search with a Manhattan heuristic (octile if diagonal=True).
+        Finds the shortest path like BFS but expands cells in order of
+        f = g + h, so it heads toward the goal instead of flooding outward.
+        
+        Args:
+            start: Tuple (row, col) for start position
+            end: Tuple (row, col) for end position
+            diagonal: Allow 8-connected moves (diagonal cost sqrt(2))
+            
+        Returns:
+            Tuple (path, nodes_explored)
+        """
+        if self._unreachable(start, end):
+            return None, 0
+        
+        grid = self._maze
+        cols = self.cols
+        size = self.rows * cols
+        moves = self.directions + (self.diagonal_directions if diagonal else [])
+        closed = BitSet(size)
+        parent = grid.new_parents()
+        g = array('d' if diagonal else 'i', [-1]) * size  # -1 = not reached yet
+        
+        start_index = grid.index(*start)
+        end_index = grid.index(*end)
+        g[start_index] = 0
+        h = self._heuristic(start[0], start[1], end, diagonal)
+        # Priority queue: (f, h, index); lower h breaks f ties toward the goal
+        open_list = [(h, h, start_index)]
+        nodes_explored = 0
+        
+        while open_list:
+            _, _, index = heapq.heappop(open_list)
+            if index in closed:
+                continue  # Stale entry superseded by a cheaper push
+            closed.add(index)
+            nodes_explored += 1
+            
+            if index == end_index:
+                return grid.trace_path(parent, index), nodes_explored
+            
+            row, col = divmod(index, cols)
+            for dr, dc in moves:
+                if not self._can_move(row, col, dr, dc):
+                    continue
+                new_index = index + dr * cols + dc
+                if new_index in closed:
+                    continue
+                
+                new_g = g[index] + (DIAGONAL_COST if dr and dc else 1)
+                if g[new_index] == -1 or new_g < g[new_index]:
+                    g[new_index] = new_g
+                    parent[new_index] = index
+                    h = self._heuristic(row + dr, col + dc, end, diagonal)
+                    heapq.heappush(open_list, (new_g + h, h, new_index))
         
-        if dfs_recursive(start[0], start[1]):
-            return path, nodes_explored[0]
-        return None, nodes_explored[0]
+        return None, nodes_explored
+    
+    def _has_forced_neighbor(self, row, col, dr, dc):
+        """
+        Check whether a straight move (dr, dc) arriving at (row, col) has a
+        forced neighbor: an open side cell whose cell behind it is a wall.
+        """
+        if dr:
+            return any(self._is_open(row, col + s) and not self._is_open(row - dr, col + s)
+                       for s in (1, -1))
+        return any(self._is_open(row + s, col) and not self._is_open(row + s, col - dc)
+                   for s in (1, -1))
+    
+    def _jump(self, row, col, dr, dc, end, diagonal):
+        """
+        Move from (row, col) in direction (dr, dc) until reaching the goal, a
+        cell with a forced neighbor, or a wall. Returns the jump point or None.
+        """
+        while self._can_move(row, col, dr, dc):
+            row += dr
+            col += dc
+            
+            if (row, col) == end:
+                return row, col
+            
+            if dr and dc:
+                # Diagonal: stop where either straight sub-jump finds something
+                if (self._jump(row, col, dr, 0, end, diagonal) is not None or
+                        self._jump(row, col, 0, dc, end, diagonal) is not None):
+                    return row, col
+            elif dr and not diagonal:
+                # 4-connected vertical moves branch sideways at every step
+                if (self._jump(row, col, 0, 1, end, diagonal) is not None or
+                        self._jump(row, col, 0, -1, end, diagonal) is not None):
+                    return row, col
+            elif self._has_forced_neighbor(row, col, dr, dc):
+                return row, col
+        
+        return None
+    
+    def _jump_directions(self, row, col, dr, dc, diagonal):
+        """Pruned search directions at a jump point reached by moving (dr, dc)."""
+        if dr and dc:
+            return [(dr, 0), (0, dc), (dr, dc)]
+        if dr and not diagonal:
+            return [(dr, 0), (0, 1), (0, -1)]
+        
+        directions = [(dr, dc)]
+        for s in (1, -1):
+            side = (0, s) if dr else (s, 0)
+            behind_open = (self._is_open(row - dr, col + s) if dr
+                           else self._is_open(row + s, col - dc))
+            if self._is_open(row + side[0], col + side[1]) and not behind_open:
+                directions.append(side)
+                if diagonal:
+                    directions.append((dr, s) if dr else (s, dc))
+        return directions
+    
+    def jump_point_search(self, start, end, diagonal=False):
+        """
+        Jump Point Search: A* on uniform-cost grids that skips over symmetric
+        paths. Instead of adding every neighbor to the open list, it jumps in
+        a straight (or diagonal) line and only stops at the goal or at cells
+        with forced neighbors, so open rooms cost a handful of expansions.
+        
+        Args:
+            start: Tuple (row, col) for start position
+            end: Tuple (row, col) for end position
+            diagonal: Allow 8-connected moves (diagonal cost sqrt(2))
+            
+        Returns:
+            Tuple (path, nodes_explored) where nodes_explored counts the
+            jump points expanded
+        """
+        if self._unreachable(start, end):
+            return None, 0
+        
+        grid = self._maze
+        cols = self.cols
+        start_index = grid.index(*start)
+        end_index = grid.index(*end)
+        
+        # Only jump points are ever stored, so sparse dicts stay small
+        g = {start_index: 0}
+        parent = {start_index: -1}
+        closed = set()
+        h = self._heuristic(start[0], start[1], end, diagonal)
+        open_list = [(h, h, start_index)]
+        nodes_explored = 0
+        
+        while open_list:
+            _, _, index = heapq.heappop(open_list)
+            if index in closed:
+                continue
+            closed.add(index)
+            nodes_explored += 1
+            
+            if index == end_index:
+                return self._expand_jump_path(grid.trace_path(parent, index)), nodes_explored
+            
+            row, col = divmod(index, cols)
+            if parent[index] == -1:
+                directions = self.directions + (self.diagonal_directions if diagonal else [])
+            else:
+                parent_row, parent_col = divmod(parent[index], cols)
+                dr = (row > parent_row) - (row < parent_row)
+                dc = (col > parent_col) - (col < parent_col)
+                directions = self._jump_directions(row, col, dr, dc, diagonal)
+            
+            for dr, dc in directions:
+                jump_point = self._jump(row, col, dr, dc, end, diagonal)
+                if jump_point is None:
+                    continue
+                jump_index = grid.index(*jump_point)
+                if jump_index in closed:
+                    continue
+                
+                steps = max(abs(jump_point[0] - row), abs(jump_point[1] - col))
+                new_g = g[index] + steps * (DIAGONAL_COST if dr and dc else 1)
+                if jump_index not in g or new_g < g[jump_index]:
+                    g[jump_index] = new_g
+                    parent[jump_index] = index
+                    h = self._heuristic(jump_point[0], jump_point[1], end, diagonal)
+                    heapq.heappush(open_list, (new_g + h, h, jump_index))
+        
+        return None, nodes_explored
+    
+    def _expand_jump_path(self, jump_points):
+        """Fill in the cells between consecutive jump points."""
+        path = [jump_points[0]]
+        for target_row, target_col in jump_points[1:]:
+            row, col = path[-1]
+            dr = (target_row > row) - (target_row < row)
+            dc = (target_col > col) - (target_col < col)
+            while (row, col) != (target_row, target_col):
+                row += dr
+                col += dc
+                path.append((row, col))
+        return path
     
     def visualize_path(self, path, algorithm_name):
         """Visualize the maze with the path."""
@@ -188,16 +1547,38 @@ def main():
         print(f"Path: {dfs_path[:5]}...{dfs_path[-3:]}")
         solver.visualize_path(dfs_path, "DFS")
     
+    # A* and Jump Point Search
+    print("\n--- A* Search (Manhattan) ---")
+    start_time = time.time()
+    astar_path, astar_nodes = solver.a_star(start, end)
+    astar_time = time.time() - start_time
+    
+    if astar_path:
+        print(f"Path found! Length: {len(astar_path)}")
+        print(f"Nodes explored: {astar_nodes}")
+        print(f"Time taken: {astar_time:.6f} seconds")
+    
+    print("\n--- Jump Point Search (JPS) ---")
+    start_time = time.time()
+    jps_path, jps_nodes = solver.jump_point_search(start, end)
+    jps_time = time.time() - start_time
+    
+    if jps_path:
+        print(f"Path found! Length: {len(jps_path)}")
+        print(f"Jump points expanded: {jps_nodes}")
+        print(f"Time taken: {jps_time:.6f} seconds")
+    
     # Comparison
     print("\n" + "=" * 60)
-    print("COMPARISON: BFS vs DFS")
+    print("COMPARISON: BFS vs DFS vs A* vs JPS")
     print("=" * 60)
-    print(f"{'Metric':<25} {'BFS':<15} {'DFS':<15}")
+    print(f"{'Metric':<20} {'BFS':<10} {'DFS':<10} {'A*':<10} {'JPS':<10}")
     print("-" * 60)
-    print(f"{'Path Length':<25} {len(bfs_path) if bfs_path else 'N/A':<15} {len(dfs_path) if dfs_path else 'N/A':<15}")
-    print(f"{'Nodes Explored':<25} {bfs_nodes:<15} {dfs_nodes:<15}")
-    print(f"{'Time (seconds)':<25} {bfs_time:<15.6f} {dfs_time:<15.6f}")
-    print(f"{'Optimal Path?':<25} {'Yes':<15} {'No':<15}")
+    print(f"{'Path Length':<20} {len(bfs_path) if bfs_path else 'N/A':<10} {len(dfs_path) if dfs_path else 'N/A':<10} "
+          f"{len(astar_path) if astar_path else 'N/A':<10} {len(jps_path) if jps_path else 'N/A':<10}")
+    print(f"{'Nodes Explored':<20} {bfs_nodes:<10} {dfs_nodes:<10} {astar_nodes:<10} {jps_nodes:<10}")
+    print(f"{'Time (seconds)':<20} {bfs_time:<10.6f} {dfs_time:<10.6f} {astar_time:<10.6f} {jps_time:<10.6f}")
+    print(f"{'Optimal Path?':<20} {'Yes':<10} {'No':<10} {'Yes':<10} {'Yes':<10}")
     
     print("\n" + "=" * 60)
     print("ANALYSIS:")
@@ -208,6 +1589,7 @@ def main():
     print(f"• BFS path length: {len(bfs_path) if bfs_path else 'N/A'} vs DFS path length: {len(dfs_path) if dfs_path else 'N/A'}")
     print("• BFS uses more memory (queue) but guarantees optimality")
     print("• DFS uses less memory (stack/recursion) but may find longer paths")
+    print("• A* and JPS are also optimal; JPS jumps over symmetric paths to expand far fewer nodes")
 
 
 if __name__ == "__main__":
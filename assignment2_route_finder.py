@@ -6,82 +6,319 @@ Problem Statement: Represent a city map as a graph where intersections are nodes
 and roads are edges. Find the shortest path between two locations.
 """
 
-from collections import deque
+from array import array
+import ast
+from collections import OrderedDict, deque
+import csv
+import heapq
+import itertools
+import os
+import random
+import struct
 import time
-import matplotlib.pyplot as plt
-import networkx as nx
+
+INFINITY = float('inf')
+
+# Binary edge file / graph snapshot format
+EDGE_MAGIC = b'EDGE'
+EDGE_VERSION = 2
+EDGE_HEADER = struct.Struct('<4sBBxxIQQ')  # magic, version, flags, labels, label table bytes, edge records
+EDGE_CHUNK = struct.Struct('<Ic')          # records in the chunk, weight typecode ('q' or 'd')
+EDGE_DEDUPLICATED = 1                      # Header flag: no road appears twice
+EDGE_DIRECTED = 2                          # Header flag: some roads are one-way
+EDGE_LABEL_STR = 0                         # Label table tag: UTF-8 string
+EDGE_LABEL_LITERAL = 1                     # Label table tag: Python literal, read with ast.literal_eval
+
+# Column names recognised as the header row of a text edge list without weights
+HEADER_COLUMNS = frozenset({('from', 'to'), ('source', 'target'), ('src', 'dst'), ('u', 'v'),
+                            ('start', 'end'), ('origin', 'destination'), ('node1', 'node2')})
+
+# Contraction hierarchy file format (label table as in edge files)
+CH_MAGIC = b'CHIE'
+CH_HEADER = struct.Struct('<4sBcxxIQQQQ')  # magic, version, weight typecode, labels, label table bytes,
+                                           # forward up edges, backward up edges, shortcuts
 
 
 class CityGraph:
     def __init__(self):
         """Initialize an empty city graph."""
         self.graph = {}
+        self.weights = {}  # (u, v) -> road length/travel time, for weighted searches
+        self.version = 0   # Bumped on every change, for caches derived from the graph
+        self._directed = False  # Set once any road may exist in one direction only
+        self._reverse = None  # Predecessor lists, built on first use and then kept in step
+        self._frozen_cache = (None, None)   # (version, CSRGraph for whole-graph searches)
+        self.landmarks = None  # LandmarkIndex from build_landmarks()
+        self.route_cache = None  # RouteCache from enable_route_cache()
+        self.closed_roads = {}  # (u, v) -> weight of roads closed by remove_edge()
+        
+    def add_edge(self, u, v, bidirectional=True, weight=1):
+        """
+        Add an edge between two nodes.
         
-    def add_edge(self, u, v, bidirectional=True):
-        """Add an edge between two nodes."""
+        Args:
+            u, v: Nodes to connect
+            bidirectional: Also add the road from v back to u
+            weight: Road length or travel time (used by the Dijkstra searches;
+                    for parallel roads the shortest one counts)
+        """
         if u not in self.graph:
             self.graph[u] = []
         if v not in self.graph:
             self.graph[v] = []
         
         self.graph[u].append(v)
+        self.weights[(u, v)] = min(weight, self.weights.get((u, v), weight))
         if bidirectional:
             self.graph[v].append(u)
+            self.weights[(v, u)] = min(weight, self.weights.get((v, u), weight))
+        else:
+            self._directed = True
+        reverse = self._reverse
+        if reverse is not None:
+            reverse.setdefault(u, [])
+            reverse.setdefault(v, []).append(u)
+            if bidirectional:
+                reverse[u].append(v)
+        self.closed_roads.pop((u, v), None)
+        if bidirectional:
+            self.closed_roads.pop((v, u), None)
+        self.version += 1
+        
+        self._invalidate_shortcuts(u, v)
+        if bidirectional:
+            self._invalidate_shortcuts(v, u)
+    
+    def remove_edge(self, u, v, bidirectional=True):
+        """
+        Close a road (all parallel copies of it); restore_edge() reopens it.
+        
+        Cached routes that used the road are invalidated; routes that did
+        not use it stay shortest, so they are still served from the cache.
+        
+        Args:
+            u, v: Road end points
+            bidirectional: Also close the road from v back to u, if present
+        """
+        if (u, v) not in self.weights:
+            raise KeyError(f"No road from {u!r} to {v!r}")
+        roads = [(u, v)]
+        if bidirectional and v != u and (v, u) in self.weights:
+            roads.append((v, u))
+        
+        for a, b in roads:
+            self.graph[a] = [neighbor for neighbor in self.graph[a] if neighbor != b]
+            if self._reverse is not None:
+                self._reverse[b] = [neighbor for neighbor in self._reverse[b] if neighbor != a]
+            self.closed_roads[(a, b)] = self.weights.pop((a, b))
+            if self.route_cache is not None:
+                self.route_cache.invalidate_road(a, b)
+        if not bidirectional:
+            self._directed = True  # The two directions may now differ
+        self.version += 1
+    
+    def restore_edge(self, u, v, bidirectional=True):
+        """
+        Reopen a road closed by remove_edge(), with its old weight.
+        
+        Only cached routes that the reopened road could shorten are
+        invalidated.
+        
+        Args:
+            u, v: Road end points
+            bidirectional: Also reopen the road from v back to u, if closed
+        """
+        if (u, v) not in self.closed_roads:
+            raise KeyError(f"Road from {u!r} to {v!r} is not closed")
+        roads = [(u, v)]
+        if bidirectional and v != u and (v, u) in self.closed_roads:
+            roads.append((v, u))
+        
+        for a, b in roads:
+            self.graph[a].append(b)
+            if self._reverse is not None:
+                self._reverse[b].append(a)
+            self.weights[(a, b)] = self.closed_roads.pop((a, b))
+        if not bidirectional:
+            self._directed = True
+        self.version += 1
+        
+        for a, b in roads:
+            self._invalidate_shortcuts(a, b)
+    
+    def enable_route_cache(self, capacity=1024):
+        """Serve repeated bfs()/bidirectional_bfs() queries from a RouteCache."""
+        self.route_cache = RouteCache(capacity)
+        return self.route_cache
+    
+    def _invalidate_shortcuts(self, u, v):
+        """
+        Drop cached routes that the new road u -> v makes longer than needed:
+        those with hops(start, u) + 1 + hops(v, end) < cached length.
+        Cached "no route" answers are always dropped. The search back from
+        u stops at the longest cached route; the search on from v only goes
+        as far as the routes it reached can still be shortened, and is
+        skipped when none can.
+        """
+        cache = self.route_cache
+        if not cache:
+            return
+        for key in list(cache.unreachable):
+            cache.discard(key)  # The new road may connect them
+        lengths = {key: len(path) - 1 for key, (path, _) in cache.entries.items()}
+        if not lengths:
+            return
+        to_u = self._hop_distances(u, self._predecessors(), max(lengths.values()) - 1)
+        slack = {key: length - 1 - to_u[key[1]] for key, length in lengths.items()
+                 if key[1] in to_u and length - 1 - to_u[key[1]] > 0}
+        if not slack:
+            return
+        from_v = self._hop_distances(v, self.graph, max(slack.values()))
+        for key, room in slack.items():
+            if from_v.get(key[2], room) < room:
+                cache.discard(key)
+    
+    def _hop_distances(self, source, adjacency, limit):
+        """Hop counts from source over adjacency, for nodes closer than limit."""
+        distance = {source: 0}
+        frontier = [source]
+        depth = 0
+        while frontier and depth + 1 < limit:
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for neighbor in adjacency[node]:
+                    if neighbor not in distance:
+                        distance[neighbor] = depth
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return distance
+    
+    def _predecessors(self):
+        """
+        Reverse adjacency (same as self.graph when every road is two-way).
+        Built once; add_edge(), remove_edge() and restore_edge() then update
+        it in place, so road changes never trigger a full rebuild.
+        """
+        if not self._directed:
+            return self.graph
+        if self._reverse is None:
+            reverse = {node: [] for node in self.graph}
+            for node, neighbors in self.graph.items():
+                for neighbor in neighbors:
+                    reverse[neighbor].append(node)
+            self._reverse = reverse
+        return self._reverse
     
     def bfs(self, start, end):
         """Standard BFS implementation."""
+        if self.route_cache is not None:
+            return self.route_cache.fetch(('bfs', start, end),
+                                          lambda: self.bounded_bfs(start, end)[:2])
+        path, nodes_explored, _, _ = self.bounded_bfs(start, end)
+        return path, nodes_explored
+    
+    def bounded_bfs(self, start, end, max_frontier=None):
+        """
+        BFS that records parent pointers and builds the path once at the end,
+        like bidirectional_bfs, instead of copying a path per queued node.
+        
+        Args:
+            start: Start node
+            end: End node
+            max_frontier: Optional cap on the queue size; the search gives up
+                          (returning no path) rather than grow past it
+            
+        Returns:
+            Tuple (path, nodes_explored, peak_frontier, truncated) where
+            truncated is True if the search gave up at max_frontier, so a
+            None path means "unknown" rather than "unreachable"
+        """
         if start not in self.graph or end not in self.graph:
-            return None, 0
+            return None, 0, 0, False
         
-        visited = {start}
-        queue = deque([(start, [start])])
+        parent = {start: None}
+        queue = deque([start])
         nodes_explored = 0
+        peak_frontier = 1
         
         while queue:
-            node, path = queue.popleft()
+            node = queue.popleft()
             nodes_explored += 1
             
             if node == end:
-                return path, nodes_explored
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                path.reverse()
+                return path, nodes_explored, peak_frontier, False
             
             for neighbor in self.graph.get(node, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
+                if neighbor not in parent:
+                    parent[neighbor] = node
+                    queue.append(neighbor)
+            
+            if len(queue) > peak_frontier:
+                peak_frontier = len(queue)
+                if max_frontier is not None and peak_frontier > max_frontier:
+                    return None, nodes_explored, peak_frontier, True
         
-        return None, nodes_explored
+        return None, nodes_explored, peak_frontier, False
     
     def dfs(self, start, end):
-        """Standard DFS implementation."""
+        """
+        Standard DFS implementation.
+        Uses an explicit stack of neighbor iterators and a single shared path
+        list, so deep graphs need neither recursion nor per-level path copies.
+        """
         if start not in self.graph or end not in self.graph:
             return None, 0
         
-        visited = set()
-        nodes_explored = [0]
+        visited = {start}
+        nodes_explored = 1
         
-        def dfs_recursive(node, path):
-            visited.add(node)
-            nodes_explored[0] += 1
-            
-            if node == end:
-                return path
-            
-            for neighbor in self.graph.get(node, []):
+        if start == end:
+            return [start], nodes_explored
+        
+        path = [start]
+        stack = [iter(self.graph[start])]
+        
+        while stack:
+            for neighbor in stack[-1]:
                 if neighbor not in visited:
-                    result = dfs_recursive(neighbor, path + [neighbor])
-                    if result:
-                        return result
-            
-            return None
+                    visited.add(neighbor)
+                    nodes_explored += 1
+                    path.append(neighbor)
+                    
+                    if neighbor == end:
+                        return path, nodes_explored
+                    
+                    stack.append(iter(self.graph.get(neighbor, [])))
+                    break
+            else:
+                # All neighbors tried: backtrack
+                stack.pop()
+                path.pop()
         
-        path = dfs_recursive(start, [start])
-        return path, nodes_explored[0]
+        return None, nodes_explored
     
     def bidirectional_bfs(self, start, end):
         """
         Bi-directional BFS: Search from both start and end simultaneously.
         Stops when the two searches meet.
         """
+        if self.route_cache is not None:
+            return self.route_cache.fetch(('bidirectional_bfs', start, end),
+                                          lambda: self._bidirectional_bfs(start, end))
+        return self._bidirectional_bfs(start, end)
+    
+    def _bidirectional_bfs(self, start, end):
+        """
+        Uncached bidirectional_bfs(). The backward half follows roads into
+        each node, so on one-way roads both halves agree with bfs() about
+        which routes exist.
+        """
         if start not in self.graph or end not in self.graph:
             return None, 0
         
@@ -92,9 +329,10 @@ class CityGraph:
         visited_forward = {start: None}
         queue_forward = deque([start])
         
-        # Backward search from end
+        # Backward search from end, over predecessor lists
         visited_backward = {end: None}
         queue_backward = deque([end])
+        predecessors = self._predecessors()
         
         nodes_explored = 0
         
@@ -121,7 +359,7 @@ class CityGraph:
                 current_backward = queue_backward.popleft()
                 nodes_explored += 1
                 
-                for neighbor in self.graph.get(current_backward, []):
+                for neighbor in predecessors.get(current_backward, []):
                     if neighbor in visited_forward:
                         # Found intersection point!
                         return self._construct_bidirectional_path(
@@ -135,6 +373,217 @@ class CityGraph:
         
         return None, nodes_explored
     
+    def dijkstra(self, start, end):
+        """
+        Dijkstra's algorithm on edge weights, using a binary heap with lazy
+        deletion (stale entries are skipped when popped) and stopping as
+        soon as end is settled.
+        
+        Returns:
+            Tuple (path, nodes_settled)
+        """
+        if start not in self.graph or end not in self.graph:
+            return None, 0
+        
+        dist = {start: 0}
+        parent = {start: None}
+        settled = set()
+        counter = itertools.count()  # Tie-breaker so labels are never compared
+        heap = [(0, next(counter), start)]
+        
+        while heap:
+            d, _, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+            
+            if node == end:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                path.reverse()
+                return path, len(settled)
+            
+            for neighbor in self.graph[node]:
+                new_dist = d + self.weights[(node, neighbor)]
+                if neighbor not in dist or new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (new_dist, next(counter), neighbor))
+        
+        return None, len(settled)
+    
+    def bidirectional_dijkstra(self, start, end):
+        """
+        Bi-directional Dijkstra: grow shortest-path trees from start and
+        (over reversed roads) from end, always advancing the side with the
+        smaller tentative distance. Every edge reaching the other side's
+        tree updates the best route mu; the search stops once the two queue
+        minima sum to at least mu, which guarantees mu is optimal.
+        
+        Returns:
+            Tuple (path, nodes_settled)
+        """
+        if start not in self.graph or end not in self.graph:
+            return None, 0
+        
+        if start == end:
+            return [start], 1
+        
+        sides = []
+        for root, adjacency, forward in ((start, self.graph, True),
+                                         (end, self._predecessors(), False)):
+            sides.append({
+                'dist': {root: 0},
+                'parent': {root: None},
+                'settled': set(),
+                'heap': [(0, 0, root)],
+                'adjacency': adjacency,
+                'forward': forward,
+            })
+        counter = itertools.count(1)
+        best = float('inf')
+        meeting = None
+        
+        def top(side):
+            heap = side['heap']
+            while heap and heap[0][2] in side['settled']:
+                heapq.heappop(heap)
+            return heap[0][0] if heap else float('inf')
+        
+        while True:
+            top_forward, top_backward = top(sides[0]), top(sides[1])
+            if top_forward + top_backward >= best:
+                break
+            side, other = (sides[0], sides[1]) if top_forward <= top_backward else (sides[1], sides[0])
+            
+            d, _, node = heapq.heappop(side['heap'])
+            side['settled'].add(node)
+            
+            for neighbor in side['adjacency'][node]:
+                edge = (node, neighbor) if side['forward'] else (neighbor, node)
+                new_dist = d + self.weights[edge]
+                if neighbor not in side['dist'] or new_dist < side['dist'][neighbor]:
+                    side['dist'][neighbor] = new_dist
+                    side['parent'][neighbor] = node
+                    heapq.heappush(side['heap'], (new_dist, next(counter), neighbor))
+                if neighbor in other['dist'] and new_dist + other['dist'][neighbor] < best:
+                    best = new_dist + other['dist'][neighbor]
+                    meeting = edge
+        
+        nodes_settled = len(sides[0]['settled']) + len(sides[1]['settled'])
+        if meeting is None:
+            return None, nodes_settled
+        return self._construct_bidirectional_path(
+            sides[0]['parent'], sides[1]['parent'], meeting[0], meeting[1], start, end
+        ), nodes_settled
+    
+    def build_landmarks(self, num_landmarks=8, strategy='farthest'):
+        """
+        Precompute ALT landmark distance tables (see LandmarkIndex).
+        Must be rebuilt after the graph changes.
+        """
+        self.landmarks = LandmarkIndex(self, num_landmarks, strategy)
+        return self.landmarks
+    
+    def alt_astar(self, start, end, bidirectional=False, compare=False):
+        """
+        A* with ALT (A*, Landmarks, Triangle inequality) lower bounds.
+        
+        Args:
+            start: Start node
+            end: End node
+            bidirectional: Search from both ends with averaged potentials
+            compare: Also run dijkstra() and report the settled-node reduction
+            
+        Returns:
+            Tuple (path, nodes_settled, stats) where stats holds the
+            landmark table size in bytes and, with compare=True, the
+            Dijkstra settled count and the fraction of nodes saved
+        """
+        if self.landmarks is None or self.landmarks.version != self.version:
+            raise ValueError("Landmarks missing or stale: call build_landmarks() first")
+        search = self.landmarks.bidirectional_astar if bidirectional else self.landmarks.astar
+        path, nodes_settled = search(start, end)
+        
+        stats = {'landmarks': len(self.landmarks.landmarks),
+                 'table_bytes': self.landmarks.table_bytes}
+        if compare:
+            _, dijkstra_settled = self.dijkstra(start, end)
+            stats['dijkstra_settled'] = dijkstra_settled
+            stats['reduction'] = 1 - nodes_settled / dijkstra_settled if dijkstra_settled else 0.0
+        return path, nodes_settled, stats
+    
+    def balanced_bidirectional_bfs(self, start, end, balance='frontier'):
+        """
+        Level-synchronous bi-directional BFS.
+        
+        Each step expands one whole BFS level, from the side whose frontier
+        is cheaper: fewer nodes (balance='frontier') or fewer outgoing
+        edges in total (balance='degree'). When a level first touches the
+        other search, every meeting edge in that level is considered and the
+        shortest is kept, so the path is always a shortest path. The
+        backward side follows roads in reverse, so one-way roads are handled.
+        
+        Returns:
+            Tuple (path, nodes_explored, stats) where stats['forward'] and
+            stats['backward'] hold levels, nodes_expanded and edges_scanned
+        """
+        stats = {side: {'levels': 0, 'nodes_expanded': 0, 'edges_scanned': 0}
+                 for side in ('forward', 'backward')}
+        if start not in self.graph or end not in self.graph:
+            return None, 0, stats
+        if start == end:
+            return [start], 1, stats
+        
+        predecessors = self._predecessors()
+        sides = {
+            'forward': {'parent': {start: None}, 'dist': {start: 0},
+                        'frontier': [start], 'adjacency': self.graph},
+            'backward': {'parent': {end: None}, 'dist': {end: 0},
+                         'frontier': [end], 'adjacency': predecessors},
+        }
+        
+        def cost(name):
+            side = sides[name]
+            if balance == 'degree':
+                return sum(len(side['adjacency'][node]) for node in side['frontier'])
+            return len(side['frontier'])
+        
+        while sides['forward']['frontier'] and sides['backward']['frontier']:
+            name = 'forward' if cost('forward') <= cost('backward') else 'backward'
+            other_name = 'backward' if name == 'forward' else 'forward'
+            side, other = sides[name], sides[other_name]
+            side_stats = stats[name]
+            side_stats['levels'] += 1
+            
+            best = None
+            next_frontier = []
+            for node in side['frontier']:
+                side_stats['nodes_expanded'] += 1
+                for neighbor in side['adjacency'][node]:
+                    side_stats['edges_scanned'] += 1
+                    if neighbor in other['dist']:
+                        length = side['dist'][node] + 1 + other['dist'][neighbor]
+                        if best is None or length < best[0]:
+                            best = (length, node, neighbor)
+                    if neighbor not in side['parent']:
+                        side['parent'][neighbor] = node
+                        side['dist'][neighbor] = side['dist'][node] + 1
+                        next_frontier.append(neighbor)
+            side['frontier'] = next_frontier
+            
+            if best is not None:
+                _, node, neighbor = best
+                meet_forward, meet_backward = (node, neighbor) if name == 'forward' else (neighbor, node)
+                path = self._construct_bidirectional_path(
+                    sides['forward']['parent'], sides['backward']['parent'],
+                    meet_forward, meet_backward, start, end)
+                return path, stats['forward']['nodes_expanded'] + stats['backward']['nodes_expanded'], stats
+        
+        return None, stats['forward']['nodes_expanded'] + stats['backward']['nodes_expanded'], stats
+    
     def _construct_bidirectional_path(self, visited_forward, visited_backward, 
                                      meet_forward, meet_backward, start, end):
         """Construct the complete path from bidirectional search."""
@@ -156,58 +605,1304 @@ class CityGraph:
         # Combine paths
         return path_forward + path_backward
     
-    def visualize_graph(self, path=None, algorithm_name="Graph", explored_nodes=None):
-        """Visualize the graph using networkx and matplotlib."""
-        try:
-            G = nx.Graph()
+    def freeze(self):
+        """Return a compact, read-only CSRGraph copy for fast repeated queries."""
+        return CSRGraph.from_city_graph(self)
+    
+    def _frozen(self):
+        """CSRGraph of the current graph, rebuilt only after the graph changes."""
+        version, frozen = self._frozen_cache
+        if version != self.version:
+            frozen = self.freeze()
+            self._frozen_cache = (self.version, frozen)
+        return frozen
+    
+    def direction_optimizing_bfs(self, start, alpha=14, beta=24):
+        """
+        Single-source BFS over the whole graph, switching to bottom-up steps
+        when the frontier gets large (see CSRGraph.direction_optimizing_bfs).
+        The CSR copy and its transpose are reused until the graph changes.
+        
+        Returns:
+            Tuple (distance, parent, stats) where distance maps every reached
+            node to its hop count and parent maps it to its BFS parent (None
+            for the start)
+        """
+        frozen = self._frozen()
+        dist, par, stats = frozen.direction_optimizing_bfs(start, alpha, beta)
+        labels = frozen.labels
+        distance = {}
+        parent = {}
+        for node, hops in enumerate(dist):
+            if hops != -1:
+                distance[labels[node]] = hops
+                parent[labels[node]] = labels[par[node]] if par[node] != -1 else None
+        return distance, parent, stats
+    
+    def multi_source_bfs(self, sources, batch_size=64):
+        """
+        Hop distances from many sources in shared traversals
+        (see CSRGraph.multi_source_bfs). The CSR copy is reused until the
+        graph changes.
+        
+        Returns:
+            Tuple (distance, columns, stats): distance is a flat array('i')
+            sources x nodes matrix where distance[row * len(columns) + col]
+            is the hop count from sources[row] to columns[col], -1 if
+            unreachable
+        """
+        frozen = self._frozen()
+        distance, stats = frozen.multi_source_bfs(list(sources), batch_size)
+        return distance, frozen.labels, stats
+    
+    def visualize_graph(self, path=None, algorithm_name="Graph", explored_nodes=None,
+                        hops=None, positions=None):
+        """
+        Visualize the graph using networkx and matplotlib.
+        
+        The plotting code lives in route_visualization, which is imported
+        only here, so searching never pays for loading the plotting stack.
+        The layout is cached until the graph changes; with hops=k only the
+        k-hop neighbourhood of the path is drawn.
+        """
+        from route_visualization import visualize_graph
+        visualize_graph(self, path, algorithm_name, explored_nodes, hops=hops, positions=positions)
+
+
+class RouteCache:
+    """
+    Bounded LRU cache of route answers, indexed by the roads they use.
+    
+    Entries map (method, start, end) to the (path, nodes_explored) answer.
+    Each road (u, v) on a cached path points back at the entries using it,
+    so closing a road invalidates only those entries. Answers without a
+    path are kept apart in unreachable, since any new road may connect them.
+    """
+    
+    def __init__(self, capacity=1024):
+        """
+        Args:
+            capacity: Maximum cached answers; the least recently used is
+                      evicted first
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()  # key -> (path, nodes_explored), oldest first
+        self.by_road = {}             # (u, v) -> set of keys whose path uses the road
+        self.unreachable = set()      # keys whose cached answer has no path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def fetch(self, key, search):
+        """Cached answer for key, or the result of search() (which is cached)."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        result = search()
+        self.put(key, result)
+        return result
+    
+    def put(self, key, result):
+        """Cache an answer, evicting the least recently used beyond capacity."""
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = result
+        path = result[0] or []
+        if not path:
+            self.unreachable.add(key)
+        for road in zip(path, path[1:]):
+            self.by_road.setdefault(road, set()).add(key)
+        while len(self.entries) > self.capacity:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+    
+    def discard(self, key):
+        """Invalidate one cached answer."""
+        if key in self.entries:
+            self._remove(key)
+            self.invalidations += 1
+    
+    def invalidate_road(self, u, v):
+        """Invalidate every cached answer whose path uses the road u -> v."""
+        for key in list(self.by_road.get((u, v), ())):
+            self.discard(key)
+    
+    def clear(self):
+        self.entries.clear()
+        self.by_road.clear()
+        self.unreachable.clear()
+    
+    def _remove(self, key):
+        path = self.entries.pop(key)[0] or []
+        self.unreachable.discard(key)
+        for road in zip(path, path[1:]):
+            keys = self.by_road[road]
+            keys.discard(key)
+            if not keys:
+                del self.by_road[road]
+
+
+class CSRGraph:
+    """
+    Frozen compressed-sparse-row copy of a CityGraph.
+    
+    Node labels are interned to ints 0..n-1, and the neighbors of node i are
+    targets[offsets[i]:offsets[i + 1]] with duplicate roads removed. Both
+    arrays are flat int32 arrays, so searches use byte flags and int parent
+    arrays instead of hashing labels. Searches take and return labels, with
+    the same results as the CityGraph they were built from.
+    """
+    
+    def __init__(self, labels, offsets, targets, directed=False):
+        """
+        Args:
+            labels: List mapping node id -> label
+            offsets: array('i') of length len(labels) + 1
+            targets: array('i') of neighbor ids
+            directed: True if some roads are one-way (the transpose differs)
+        """
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.targets = targets
+        self.directed = directed
+        self._transpose = None
+    
+    @classmethod
+    def from_city_graph(cls, city):
+        """Intern the labels of a CityGraph and pack its deduplicated adjacency."""
+        labels = list(city.graph)
+        index = {label: i for i, label in enumerate(labels)}
+        offsets = array('i', [0])
+        targets = array('i')
+        for label in labels:
+            seen = set()
+            for neighbor in city.graph[label]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    targets.append(index[neighbor])
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets, city._directed)
+    
+    def __contains__(self, label):
+        return label in self.index
+    
+    def __len__(self):
+        return len(self.labels)
+    
+    @property
+    def num_edges(self):
+        """Number of directed adjacency entries."""
+        return len(self.targets)
+    
+    def neighbors(self, node):
+        """Neighbor ids of a node id."""
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+    
+    def transpose(self):
+        """CSRGraph with every road reversed (cached, shares the labels)."""
+        if self._transpose is None:
+            n = len(self.labels)
+            counts = array('i', [0]) * (n + 1)
+            for target in self.targets:
+                counts[target + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            offsets = array('i', counts)
+            targets = array('i', [0]) * len(self.targets)
+            for node in range(n):
+                for i in range(self.offsets[node], self.offsets[node + 1]):
+                    target = self.targets[i]
+                    targets[counts[target]] = node
+                    counts[target] += 1
+            transposed = CSRGraph(self.labels, offsets, targets, self.directed)
+            transposed.index = self.index
+            transposed._transpose = self
+            self._transpose = transposed
+        return self._transpose
+    
+    def direction_optimizing_bfs(self, start, alpha=14, beta=24):
+        """
+        Whole-graph BFS that switches between top-down and bottom-up levels.
+        
+        Top-down levels scan the out-edges of every frontier node. Once the
+        frontier's out-edges outnumber the unexplored nodes' edges / alpha,
+        levels run bottom-up instead: each unvisited node scans its in-edges
+        and stops at the first frontier member it finds. When the frontier
+        drops below n / beta nodes, levels go back to top-down.
+        
+        Args:
+            start: Source label
+            alpha: Top-down -> bottom-up switch threshold
+            beta: Bottom-up -> top-down switch threshold
             
-            # Add edges
-            for node, neighbors in self.graph.items():
-                for neighbor in neighbors:
-                    G.add_edge(node, neighbor)
+        Returns:
+            Tuple (distance, parent, stats): array('i') by node id with -1
+            for unreached nodes (parent is also -1 for the source), and
+            stats with top_down_levels, bottom_up_levels, edges_scanned
+        """
+        n = len(self.labels)
+        distance = array('i', [-1]) * n
+        parent = array('i', [-1]) * n
+        stats = {'top_down_levels': 0, 'bottom_up_levels': 0, 'edges_scanned': 0}
+        if start not in self.index:
+            return distance, parent, stats
+        
+        offsets, targets = self.offsets, self.targets
+        reverse = self.transpose()
+        in_offsets, in_targets = reverse.offsets, reverse.targets
+        source = self.index[start]
+        distance[source] = 0
+        frontier = [source]
+        in_frontier = bytearray(n)
+        unvisited = None  # Rebuilt lazily when a bottom-up level starts
+        unexplored_edges = len(targets) - (offsets[source + 1] - offsets[source])
+        bottom_up = False
+        level = 0
+        
+        while frontier:
+            level += 1
+            if bottom_up:
+                bottom_up = len(frontier) >= n / beta
+            else:
+                frontier_edges = sum(offsets[node + 1] - offsets[node] for node in frontier)
+                bottom_up = frontier_edges > unexplored_edges / alpha
             
-            plt.figure(figsize=(12, 8))
-            pos = nx.spring_layout(G, k=2, iterations=50)
+            next_frontier = []
+            if bottom_up:
+                stats['bottom_up_levels'] += 1
+                for node in frontier:
+                    in_frontier[node] = 1
+                if unvisited is None:
+                    unvisited = [node for node in range(n) if distance[node] == -1]
+                still_unvisited = []
+                for node in unvisited:
+                    for i in range(in_offsets[node], in_offsets[node + 1]):
+                        stats['edges_scanned'] += 1
+                        if in_frontier[in_targets[i]]:
+                            parent[node] = in_targets[i]
+                            distance[node] = level
+                            next_frontier.append(node)
+                            break
+                    else:
+                        still_unvisited.append(node)
+                for node in frontier:
+                    in_frontier[node] = 0
+                unvisited = still_unvisited
+            else:
+                stats['top_down_levels'] += 1
+                for node in frontier:
+                    for i in range(offsets[node], offsets[node + 1]):
+                        stats['edges_scanned'] += 1
+                        neighbor = targets[i]
+                        if distance[neighbor] == -1:
+                            distance[neighbor] = level
+                            parent[neighbor] = node
+                            next_frontier.append(neighbor)
+                unvisited = None
             
-            # Draw all nodes
-            nx.draw_networkx_nodes(G, pos, node_color='lightblue', 
-                                  node_size=500, alpha=0.6)
+            for node in next_frontier:
+                unexplored_edges -= offsets[node + 1] - offsets[node]
+            frontier = next_frontier
+        
+        return distance, parent, stats
+    
+    def multi_source_bfs(self, sources, batch_size=64):
+        """
+        Bit-parallel BFS from many sources at once (MS-BFS).
+        
+        Sources are processed in batches of batch_size. Within a batch every
+        node carries an int bitmask of the searches that have reached it, so
+        one scan of a node's edges advances all searches that share it as a
+        frontier node. Total edge scans drop by up to the batch width
+        compared with one BFS per source.
+        
+        Args:
+            sources: Source labels (unknown labels get an all -1 row)
+            batch_size: Searches per traversal (Python ints allow any width)
             
-            # Draw all edges
-            nx.draw_networkx_edges(G, pos, alpha=0.2)
+        Returns:
+            Tuple (distance, stats): distance is a flat array('i') with
+            distance[row * len(self) + node_id] = hops from sources[row],
+            -1 if unreachable; stats has batches, levels, edges_scanned
+        """
+        n = len(self.labels)
+        offsets, targets = self.offsets, self.targets
+        distance = array('i', [-1]) * (len(sources) * n)
+        stats = {'batches': 0, 'levels': 0, 'edges_scanned': 0}
+        
+        for first in range(0, len(sources), batch_size):
+            batch = sources[first:first + batch_size]
+            stats['batches'] += 1
+            seen = [0] * n
+            visit = [0] * n
+            frontier = []
+            for bit, label in enumerate(batch):
+                if label not in self.index:
+                    continue
+                node = self.index[label]
+                if not visit[node]:
+                    frontier.append(node)
+                seen[node] |= 1 << bit
+                visit[node] |= 1 << bit
+                distance[(first + bit) * n + node] = 0
             
-            # Highlight path if provided
-            if path:
-                path_edges = [(path[i], path[i+1]) for i in range(len(path)-1)]
-                nx.draw_networkx_edges(G, pos, path_edges, edge_color='red', 
-                                      width=3, alpha=0.8)
-                
-                # Highlight path nodes
-                nx.draw_networkx_nodes(G, pos, path, node_color='orange', 
-                                      node_size=600, alpha=0.9)
+            visit_next = [0] * n
+            level = 0
+            while frontier:
+                level += 1
+                stats['levels'] += 1
+                touched = []
+                for node in frontier:
+                    searches = visit[node]
+                    visit[node] = 0
+                    for i in range(offsets[node], offsets[node + 1]):
+                        stats['edges_scanned'] += 1
+                        neighbor = targets[i]
+                        missing = searches & ~seen[neighbor]
+                        if missing:
+                            if not visit_next[neighbor]:
+                                touched.append(neighbor)
+                            visit_next[neighbor] |= missing
                 
-                # Highlight start and end
-                nx.draw_networkx_nodes(G, pos, [path[0]], node_color='green', 
-                                      node_size=700, alpha=1)
-                nx.draw_networkx_nodes(G, pos, [path[-1]], node_color='red', 
-                                      node_size=700, alpha=1)
+                for node in touched:
+                    new = visit_next[node]
+                    visit_next[node] = 0
+                    seen[node] |= new
+                    visit[node] = new
+                    while new:
+                        low = new & -new
+                        distance[(first + low.bit_length() - 1) * n + node] = level
+                        new ^= low
+                frontier = touched
+        
+        return distance, stats
+    
+    def _trace(self, parent, node):
+        """Labels on the parent chain ending at node, root first."""
+        path = []
+        while node != -1:
+            path.append(self.labels[node])
+            node = parent[node]
+        path.reverse()
+        return path
+    
+    def bfs(self, start, end):
+        """Standard BFS on int ids with a parent array."""
+        if start not in self.index or end not in self.index:
+            return None, 0
+        
+        offsets, targets = self.offsets, self.targets
+        source, goal = self.index[start], self.index[end]
+        parent = array('i', [-1]) * len(self.labels)
+        visited = bytearray(len(self.labels))
+        visited[source] = 1
+        queue = deque([source])
+        nodes_explored = 0
+        
+        while queue:
+            node = queue.popleft()
+            nodes_explored += 1
             
-            # Draw labels
-            nx.draw_networkx_labels(G, pos, font_size=10, font_weight='bold')
+            if node == goal:
+                return self._trace(parent, node), nodes_explored
             
-            plt.title(f"{algorithm_name} - Path Visualization", fontsize=16, fontweight='bold')
-            plt.axis('off')
-            plt.tight_layout()
+            for i in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[i]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parent[neighbor] = node
+                    queue.append(neighbor)
+        
+        return None, nodes_explored
+    
+    def dfs(self, start, end):
+        """Standard DFS with an explicit stack of adjacency positions."""
+        if start not in self.index or end not in self.index:
+            return None, 0
+        
+        offsets, targets = self.offsets, self.targets
+        source, goal = self.index[start], self.index[end]
+        visited = bytearray(len(self.labels))
+        visited[source] = 1
+        nodes_explored = 1
+        
+        if source == goal:
+            return [start], nodes_explored
+        
+        path = array('i', [source])
+        position = array('i', [offsets[source]])  # Next adjacency slot per path entry
+        
+        while path:
+            node = path[-1]
+            i = position[-1]
+            end_slot = offsets[node + 1]
+            while i < end_slot and visited[targets[i]]:
+                i += 1
+            if i == end_slot:
+                # All neighbors tried: backtrack
+                path.pop()
+                position.pop()
+                continue
+            position[-1] = i + 1
+            
+            neighbor = targets[i]
+            visited[neighbor] = 1
+            nodes_explored += 1
+            path.append(neighbor)
+            position.append(offsets[neighbor])
             
-            # Save the figure
-            filename = f"{algorithm_name.lower().replace(' ', '_')}_visualization.png"
-            plt.savefig(filename, dpi=300, bbox_inches='tight')
-            print(f"Visualization saved as: {filename}")
-            plt.close()
+            if neighbor == goal:
+                return [self.labels[n] for n in path], nodes_explored
+        
+        return None, nodes_explored
+    
+    def bidirectional_bfs(self, start, end):
+        """Bi-directional BFS, alternating one node from each side like CityGraph."""
+        if start not in self.index or end not in self.index:
+            return None, 0
+        
+        if start == end:
+            return [start], 1
+        
+        offsets, targets = self.offsets, self.targets
+        # The backward side follows roads into each node
+        backward = self.transpose() if self.directed else self
+        back_offsets, back_targets = backward.offsets, backward.targets
+        source, goal = self.index[start], self.index[end]
+        # -2 = not visited, -1 = search root, otherwise the parent id
+        parent_forward = array('i', [-2]) * len(self.labels)
+        parent_backward = array('i', [-2]) * len(self.labels)
+        parent_forward[source] = -1
+        parent_backward[goal] = -1
+        queue_forward = deque([source])
+        queue_backward = deque([goal])
+        nodes_explored = 0
+        
+        while queue_forward and queue_backward:
+            # Expand forward search
+            current = queue_forward.popleft()
+            nodes_explored += 1
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                if parent_backward[neighbor] != -2:
+                    return (self._trace(parent_forward, current) +
+                            self._trace(parent_backward, neighbor)[::-1]), nodes_explored
+                if parent_forward[neighbor] == -2:
+                    parent_forward[neighbor] = current
+                    queue_forward.append(neighbor)
             
-        except Exception as e:
-            print(f"Visualization requires matplotlib and networkx: {e}")
-            print("Install with: pip install matplotlib networkx")
+            # Expand backward search
+            if queue_backward:
+                current = queue_backward.popleft()
+                nodes_explored += 1
+                for i in range(back_offsets[current], back_offsets[current + 1]):
+                    neighbor = back_targets[i]
+                    if parent_forward[neighbor] != -2:
+                        return (self._trace(parent_forward, neighbor) +
+                                self._trace(parent_backward, current)[::-1]), nodes_explored
+                    if parent_backward[neighbor] == -2:
+                        parent_backward[neighbor] = current
+                        queue_backward.append(neighbor)
+        
+        return None, nodes_explored
+
+
+class LandmarkIndex:
+    """
+    ALT preprocessing: shortest-path distances to and from k landmarks.
+    
+    By the triangle inequality, d(v, t) >= d(v, L) - d(t, L) and
+    d(v, t) >= d(L, t) - d(L, v) for every landmark L, which gives an
+    admissible, consistent A* heuristic without a full hierarchy build.
+    Tables are flat float arrays indexed by interned node id.
+    """
+    
+    def __init__(self, city, num_landmarks=8, strategy='farthest', seed=0):
+        """
+        Args:
+            city: CityGraph to index
+            num_landmarks: Number of landmarks k
+            strategy: 'farthest' (each landmark far from the previous ones)
+                      or 'avoid' (grow landmarks into regions the current
+                      ones bound poorly)
+            seed: Random seed for the 'avoid' strategy's root choice
+        """
+        if strategy not in ('farthest', 'avoid'):
+            raise ValueError(f"Unknown landmark strategy: {strategy}")
+        self.version = city.version
+        self.labels = list(city.graph)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        n = len(self.labels)
+        self.forward = [[] for _ in range(n)]
+        self.backward = [[] for _ in range(n)]
+        for (u, v), weight in city.weights.items():
+            self.forward[self.index[u]].append((self.index[v], weight))
+            self.backward[self.index[v]].append((self.index[u], weight))
+        
+        self.landmarks = []
+        self.dist_from = []  # dist_from[k][v] = d(L_k, v)
+        self.dist_to = []    # dist_to[k][v] = d(v, L_k)
+        rng = random.Random(seed)
+        for _ in range(min(num_landmarks, n)):
+            if strategy == 'farthest':
+                landmark = self._farthest_candidate()
+            else:
+                landmark = self._avoid_candidate(rng.randrange(n))
+            if landmark is None or landmark in self.landmarks:
+                break
+            self.landmarks.append(landmark)
+            self.dist_from.append(self._distances(landmark, self.forward)[0])
+            self.dist_to.append(self._distances(landmark, self.backward)[0])
+    
+    def _distances(self, source, adjacency):
+        """
+        Full single-source Dijkstra over ids.
+        Returns (distance array, parent array, ids in settle order).
+        """
+        n = len(self.labels)
+        dist = array('d', [INFINITY]) * n
+        parent = array('i', [-1]) * n
+        dist[source] = 0
+        heap = [(0, source)]
+        order = []
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            order.append(node)
+            for neighbor, weight in adjacency[node]:
+                if d + weight < dist[neighbor]:
+                    dist[neighbor] = d + weight
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (d + weight, neighbor))
+        return dist, parent, order
+    
+    def _farthest_candidate(self):
+        """Node farthest from all landmarks so far (from node 0 for the first one)."""
+        if not self.landmarks:
+            dist = self._distances(0, self.forward)[0]
+            closest = [d if d != INFINITY else -1 for d in dist]
+        else:
+            closest = [min(table[v] for table in self.dist_from) for v in range(len(self.labels))]
+            closest = [d if d != INFINITY else -1 for d in closest]
+        best = max(range(len(closest)), key=closest.__getitem__)
+        return best if closest[best] > 0 or not self.landmarks else None
+    
+    def _avoid_candidate(self, root):
+        """
+        Goldberg-Werneck 'avoid': in the shortest-path tree from root, weight
+        each node by how much the current landmarks underestimate its
+        distance, skip subtrees already containing a landmark, and walk down
+        the heaviest subtree to a leaf.
+        """
+        dist, parent, order = self._distances(root, self.forward)
+        size = {v: dist[v] - self.lower_bound(root, v) for v in order}
+        has_landmark = set(self.landmarks)
+        children = {}
+        for v in reversed(order):  # Children are settled after their parents
+            if parent[v] != -1:
+                children.setdefault(parent[v], []).append(v)
+                if v in has_landmark:
+                    has_landmark.add(parent[v])
+                else:
+                    size[parent[v]] += size[v]
+        for v in has_landmark.intersection(size):
+            size[v] = 0
+        
+        node = root
+        while children.get(node):
+            node = max(children[node], key=size.__getitem__)
+        return node
+    
+    def lower_bound(self, u, v):
+        """Admissible lower bound on d(u, v) for node ids."""
+        best = 0
+        for dist_from, dist_to in zip(self.dist_from, self.dist_to):
+            to_u, to_v = dist_to[u], dist_to[v]
+            if to_u != INFINITY and to_v != INFINITY and to_u - to_v > best:
+                best = to_u - to_v
+            from_u, from_v = dist_from[u], dist_from[v]
+            if from_u != INFINITY and from_v != INFINITY and from_v - from_u > best:
+                best = from_v - from_u
+        return best
+    
+    @property
+    def table_bytes(self):
+        """Memory used by the distance tables."""
+        return sum(t.itemsize * len(t) for t in self.dist_from + self.dist_to)
+    
+    def _trace(self, parent, node):
+        path = []
+        while node != -1:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        return path
+    
+    def astar(self, start, end):
+        """
+        Unidirectional A* using lower_bound() as heuristic.
+        
+        Returns:
+            Tuple (path, nodes_settled)
+        """
+        if start not in self.index or end not in self.index:
+            return None, 0
+        source, target = self.index[start], self.index[end]
+        dist = {source: 0}
+        parent = {source: -1}
+        settled = set()
+        heap = [(self.lower_bound(source, target), source)]
+        
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+            if node == target:
+                return [self.labels[v] for v in self._trace(parent, node)], len(settled)
+            for neighbor, weight in self.forward[node]:
+                new_dist = dist[node] + weight
+                if neighbor not in settled and new_dist < dist.get(neighbor, INFINITY):
+                    dist[neighbor] = new_dist
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (new_dist + self.lower_bound(neighbor, target), neighbor))
+        
+        return None, len(settled)
+    
+    def bidirectional_astar(self, start, end):
+        """
+        Bi-directional A* with average potentials p(v) = (h_t(v) - h_s(v)) / 2,
+        which keeps reduced costs consistent in both directions. The search
+        stops once the two queue minima sum to at least the best route.
+        
+        Returns:
+            Tuple (path, nodes_settled)
+        """
+        if start not in self.index or end not in self.index:
+            return None, 0
+        source, target = self.index[start], self.index[end]
+        if source == target:
+            return [start], 1
+        
+        def potential(v):
+            return (self.lower_bound(v, target) - self.lower_bound(source, v)) / 2
+        
+        dist = ({source: 0}, {target: 0})
+        parent = ({source: -1}, {target: -1})
+        settled = (set(), set())
+        heaps = ([(potential(source), source)], [(-potential(target), target)])
+        adjacency = (self.forward, self.backward)
+        sign = (1, -1)  # Backward keys use the negated potential
+        best = INFINITY
+        meeting = None
+        
+        while heaps[0] and heaps[1]:
+            for side in (0, 1):
+                while heaps[side] and heaps[side][0][1] in settled[side]:
+                    heapq.heappop(heaps[side])
+            if not (heaps[0] and heaps[1]) or heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            
+            _, node = heapq.heappop(heaps[side])
+            settled[side].add(node)
+            for neighbor, weight in adjacency[side][node]:
+                new_dist = dist[side][node] + weight
+                if new_dist < dist[side].get(neighbor, INFINITY):
+                    dist[side][neighbor] = new_dist
+                    parent[side][neighbor] = node
+                    heapq.heappush(heaps[side], (new_dist + sign[side] * potential(neighbor), neighbor))
+                other = dist[1 - side].get(neighbor)
+                if other is not None and new_dist + other < best:
+                    best = new_dist + other
+                    meeting = (node, neighbor) if side == 0 else (neighbor, node)
+        
+        nodes_settled = len(settled[0]) + len(settled[1])
+        if meeting is None:
+            return None, nodes_settled
+        path = self._trace(parent[0], meeting[0]) + self._trace(parent[1], meeting[1])[::-1]
+        return [self.labels[v] for v in path], nodes_settled
+
+
+class ContractionHierarchy:
+    """
+    Contraction Hierarchies (CH) for fast repeated route queries.
+    
+    build() contracts nodes one at a time, least important first (by edge
+    difference plus the number of contracted neighbors). Whenever removing a
+    node would lengthen a shortest route between two of its neighbors, a
+    shortcut edge is added. Queries then run a bi-directional Dijkstra
+    that only climbs to higher-ranked nodes, so each side settles a few
+    nodes, and shortcuts are unpacked back into original roads. The
+    preprocessed hierarchy can be saved once per map release and loaded by
+    query processes.
+    """
+    
+    WITNESS_SETTLE_LIMIT = 200  # Witness searches give up (add the shortcut) beyond this
+    FILE_VERSION = 2
+    
+    def __init__(self, labels, rank, up_forward, up_backward, middle):
+        """
+        Args:
+            labels: List mapping node id -> label
+            rank: Contraction order of each node id
+            up_forward: Per node id, list of (higher node id, weight) edges
+            up_backward: Per node id, list of (higher node id, weight) reversed edges
+            middle: Dict (u, v) -> contracted node id a shortcut bypasses
+        """
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.rank = rank
+        self.up_forward = up_forward
+        self.up_backward = up_backward
+        self.middle = middle
+    
+    @classmethod
+    def build(cls, city):
+        """Contract every node of a CityGraph and return the hierarchy."""
+        labels = list(city.graph)
+        index = {label: i for i, label in enumerate(labels)}
+        n = len(labels)
+        # Edges (original and shortcuts) as u -> {v: (weight, middle id or -1)}
+        out_edges = [{} for _ in range(n)]
+        in_edges = [{} for _ in range(n)]
+        for (u, v), weight in city.weights.items():
+            u, v = index[u], index[v]
+            if u != v:
+                out_edges[u][v] = (weight, -1)
+                in_edges[v][u] = (weight, -1)
+        
+        contracted = bytearray(n)
+        contracted_neighbors = array('i', [0]) * n
+        
+        def witness_distances(source, avoid, max_cost):
+            """Bounded Dijkstra from source among uncontracted nodes, skipping avoid."""
+            dist = {source: 0}
+            heap = [(0, source)]
+            settled = 0
+            while heap and settled < cls.WITNESS_SETTLE_LIMIT:
+                d, node = heapq.heappop(heap)
+                if d > dist[node]:
+                    continue
+                if d > max_cost:
+                    break
+                settled += 1
+                for neighbor, (weight, _) in out_edges[node].items():
+                    if neighbor == avoid or contracted[neighbor]:
+                        continue
+                    new_dist = d + weight
+                    if new_dist < dist.get(neighbor, float('inf')):
+                        dist[neighbor] = new_dist
+                        heapq.heappush(heap, (new_dist, neighbor))
+            return dist
+        
+        def shortcuts_for(node):
+            """Shortcuts needed to contract node, and the number of edges it removes."""
+            ins = [(u, w) for u, (w, _) in in_edges[node].items() if not contracted[u]]
+            outs = [(x, w) for x, (w, _) in out_edges[node].items() if not contracted[x]]
+            shortcuts = []
+            if outs:
+                longest_out = max(w for _, w in outs)
+                for u, w_in in ins:
+                    dist = witness_distances(u, node, w_in + longest_out)
+                    for x, w_out in outs:
+                        if x != u and dist.get(x, float('inf')) > w_in + w_out:
+                            shortcuts.append((u, x, w_in + w_out))
+            return shortcuts, len(ins) + len(outs)
+        
+        def priority(node, shortcuts, removed):
+            return len(shortcuts) - removed + contracted_neighbors[node]
+        
+        heap = []
+        for node in range(n):
+            heap.append((priority(node, *shortcuts_for(node)), node))
+        heapq.heapify(heap)
+        rank = array('i', [0]) * n
+        order = 0
+        
+        while heap:
+            _, node = heapq.heappop(heap)
+            shortcuts, removed = shortcuts_for(node)
+            current = priority(node, shortcuts, removed)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, node))  # Lazy update: not the minimum any more
+                continue
+            
+            for u, x, weight in shortcuts:
+                if weight < out_edges[u].get(x, (float('inf'),))[0]:
+                    out_edges[u][x] = (weight, node)
+                    in_edges[x][u] = (weight, node)
+            for neighbor in itertools.chain(in_edges[node], out_edges[node]):
+                if not contracted[neighbor]:
+                    contracted_neighbors[neighbor] += 1
+            contracted[node] = 1
+            rank[node] = order
+            order += 1
+        
+        up_forward = [[] for _ in range(n)]
+        up_backward = [[] for _ in range(n)]
+        middle = {}
+        for u in range(n):
+            for x, (weight, via) in out_edges[u].items():
+                if rank[x] > rank[u]:
+                    up_forward[u].append((x, weight))
+                else:
+                    up_backward[x].append((u, weight))
+                if via != -1:
+                    middle[(u, x)] = via
+        
+        return cls(labels, rank, up_forward, up_backward, middle)
+    
+    @property
+    def num_shortcuts(self):
+        return len(self.middle)
+    
+    def save(self, path):
+        """
+        Write the hierarchy to a file for later load().
+        
+        The file holds a header, the label table (as in save_snapshot), the
+        int32 ranks, each upward adjacency as int32 offsets, int32 targets
+        and int64 weights (float64 if any weight is fractional), then the
+        shortcuts as int32 (u, v, middle) columns. Nothing is pickled, so
+        loading a hierarchy file never executes code.
+        
+        Raises:
+            ValueError: If a label cannot be stored (see save_snapshot)
+        """
+        label_table = _label_table(self.labels)
+        adjacencies = (self.up_forward, self.up_backward)
+        typecode = 'q' if all(isinstance(weight, int) for adjacency in adjacencies
+                              for edges in adjacency for _, weight in edges) else 'd'
+        counts = [sum(map(len, adjacency)) for adjacency in adjacencies]
+        with open(path, 'wb') as f:
+            f.write(CH_HEADER.pack(CH_MAGIC, self.FILE_VERSION, typecode.encode(), len(self.labels),
+                                   len(label_table), counts[0], counts[1], len(self.middle)))
+            f.write(label_table)
+            array('i', self.rank).tofile(f)
+            for adjacency in adjacencies:
+                offsets, targets, weights = array('i', [0]), array('i'), array(typecode)
+                for edges in adjacency:
+                    for target, weight in edges:
+                        targets.append(target)
+                        weights.append(weight)
+                    offsets.append(len(targets))
+                for block in (offsets, targets, weights):
+                    block.tofile(f)
+            array('i', [u for u, _ in self.middle]).tofile(f)
+            array('i', [v for _, v in self.middle]).tofile(f)
+            array('i', self.middle.values()).tofile(f)
+    
+    @classmethod
+    def load(cls, path):
+        """Read a hierarchy written by save()."""
+        with open(path, 'rb') as f:
+            raw = f.read(CH_HEADER.size)
+            if len(raw) < CH_HEADER.size:
+                raise ValueError(f"{path}: file too short for a contraction hierarchy header")
+            magic, version, typecode, n, table_bytes, forward, backward, shortcuts = CH_HEADER.unpack(raw)
+            if magic != CH_MAGIC or version != cls.FILE_VERSION or typecode not in (b'q', b'd'):
+                raise ValueError(f"{path}: unsupported contraction hierarchy file")
+            labels = _read_labels(f.read(table_bytes), n, path)
+            
+            try:
+                rank = _read_array(f, 'i', n)
+                adjacencies = []
+                for count in (forward, backward):
+                    offsets = _read_array(f, 'i', n + 1)
+                    targets = _read_array(f, 'i', count)
+                    weights = _read_array(f, typecode.decode(), count)
+                    if offsets[0] != 0 or offsets[-1] != count:
+                        raise ValueError(f"{path}: corrupt upward edge offsets")
+                    _check_ids(targets, n, path)
+                    edges = list(zip(targets.tolist(), weights.tolist()))
+                    adjacencies.append([edges[offsets[i]:offsets[i + 1]] for i in range(n)])
+                columns = [_check_ids(_read_array(f, 'i', shortcuts), n, path) for _ in range(3)]
+            except EOFError:
+                raise ValueError(f"{path}: truncated contraction hierarchy") from None
+        
+        sources, ends, vias = columns
+        middle = dict(zip(zip(sources.tolist(), ends.tolist()), vias.tolist()))
+        return cls(labels, rank, adjacencies[0], adjacencies[1], middle)
+    
+    def query(self, start, end):
+        """
+        Shortest route using the hierarchy.
+        
+        Returns:
+            Tuple (path, nodes_settled) with path in original road nodes
+        """
+        if start not in self.index or end not in self.index:
+            return None, 0
+        
+        source, target = self.index[start], self.index[end]
+        if source == target:
+            return [start], 1
+        
+        dist = ({source: 0}, {target: 0})
+        parent = ({source: -1}, {target: -1})
+        heaps = ([(0, source)], [(0, target)])
+        adjacency = (self.up_forward, self.up_backward)
+        best = float('inf')
+        meeting = -1
+        nodes_settled = 0
+        side = 0
+        
+        # Alternate sides; a side stops once its minimum can't beat best
+        while any(heap and heap[0][0] < best for heap in heaps):
+            heap = heaps[side]
+            if heap and heap[0][0] < best:
+                d, node = heapq.heappop(heap)
+                if d <= dist[side][node]:
+                    nodes_settled += 1
+                    other = dist[1 - side].get(node)
+                    if other is not None and d + other < best:
+                        best = d + other
+                        meeting = node
+                    for neighbor, weight in adjacency[side][node]:
+                        new_dist = d + weight
+                        if new_dist < dist[side].get(neighbor, float('inf')):
+                            dist[side][neighbor] = new_dist
+                            parent[side][neighbor] = node
+                            heapq.heappush(heap, (new_dist, neighbor))
+            side = 1 - side
+        
+        if meeting == -1:
+            return None, nodes_settled
+        
+        # Up to the meeting node from start, then down to end
+        route = []
+        node = meeting
+        while node != -1:
+            route.append(node)
+            node = parent[0][node]
+        route.reverse()
+        node = parent[1][meeting]
+        while node != -1:
+            route.append(node)
+            node = parent[1][node]
+        
+        path = [route[0]]
+        for u, x in zip(route, route[1:]):
+            self._unpack(u, x, path)
+        return [self.labels[node] for node in path], nodes_settled
+    
+    def _unpack(self, u, x, path):
+        """Append the original nodes after u on edge u -> x, expanding shortcuts."""
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            via = self.middle.get((a, b))
+            if via is None:
+                path.append(b)
+            else:
+                stack.append((via, b))
+                stack.append((a, via))
+
+
+def save_snapshot(city, path, chunk_size=65536):
+    """
+    Write a CityGraph to the binary edge format read by load_snapshot().
+    
+    The file holds a header, the label table, then chunks of deduplicated
+    directed roads as three packed blocks: int32 source ids, int32 target
+    ids, and int64 weights (float64 if any weight in the chunk is
+    fractional). The label table is one tag byte per label (string or
+    Python literal), their uint32 byte lengths, then the UTF-8 text of
+    every label, so loading it never executes code.
+    
+    Args:
+        city: CityGraph to write
+        path: Output file path
+        chunk_size: Roads per chunk
+    
+    Raises:
+        ValueError: If a label is neither a string nor a literal (number,
+                    tuple, ...) that reads back equal to itself
+    """
+    labels = list(city.graph)
+    index = {label: i for i, label in enumerate(labels)}
+    label_table = _label_table(labels)
+    flags = EDGE_DEDUPLICATED | (EDGE_DIRECTED if city._directed else 0)
+    with open(path, 'wb') as f:
+        f.write(EDGE_HEADER.pack(EDGE_MAGIC, EDGE_VERSION, flags, len(labels), len(label_table), 0))
+        f.write(label_table)
+        sources, targets, weights = array('i'), array('i'), []
+        records = 0
+        
+        def flush():
+            typecode = 'q' if all(isinstance(weight, int) for weight in weights) else 'd'
+            f.write(EDGE_CHUNK.pack(len(sources), typecode.encode()))
+            sources.tofile(f)
+            targets.tofile(f)
+            array(typecode, weights).tofile(f)
+            del sources[:], targets[:], weights[:]
+        
+        for u in labels:
+            seen = set()
+            for v in city.graph[u]:
+                if v in seen:
+                    continue
+                seen.add(v)
+                sources.append(index[u])
+                targets.append(index[v])
+                weights.append(city.weights.get((u, v), 1))
+                if len(sources) == chunk_size:
+                    records += len(sources)
+                    flush()
+        if sources:
+            records += len(sources)
+            flush()
+        
+        # Patch the road count into the header now that it is known
+        f.seek(0)
+        f.write(EDGE_HEADER.pack(EDGE_MAGIC, EDGE_VERSION, flags, len(labels),
+                                 len(label_table), records))
+
+
+def load_edge_list(path, delimiter=None, bidirectional=True, chunk_size=65536, header=None):
+    """
+    Build a CityGraph from an edge list file in one streaming pass.
+    
+    The file (CSV, or TSV for a .tsv extension) holds one road per line as
+    "u,v" or "u,v,weight"; blank lines, lines starting with '#', and a
+    leading column-name row such as "from,to,minutes" or "from,to" are
+    skipped. Labels
+    are interned so each node name is stored once, and repeated roads are
+    merged, keeping the smallest weight. Binary files written by
+    save_snapshot() are read with load_snapshot() instead.
+    
+    Args:
+        path: Edge list path
+        delimiter: Column separator (default from the file extension)
+        bidirectional: Add each road in both directions
+        chunk_size: Rows read per batch
+        header: True if the first row (after comments) names the columns,
+                False if there is no such row, or None to detect one: a
+                non-numeric weight column, or a pair in HEADER_COLUMNS
+        
+    Returns:
+        CityGraph
+    
+    Raises:
+        ValueError: For a row with fewer than two columns or a weight that
+                    is not a number, naming the file and line
+    """
+    if delimiter is None:
+        delimiter = '\t' if os.path.splitext(path)[1].lower() == '.tsv' else ','
+    city = CityGraph()
+    graph, weights = city.graph, city.weights
+    interned = {}  # raw label text -> the single string object used as the node
+    
+    with open(path, newline='') as f:
+        reader = rows = csv.reader(f, delimiter=delimiter)
+        consumed = 0  # Rows read before the current chunk, for error messages
+        for row in reader:
+            if row and not row[0].startswith('#'):
+                if header or (header is None and _is_header(row)):
+                    consumed += 1
+                else:
+                    rows = itertools.chain([row], reader)
+                break
+            consumed += 1
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            for offset, row in enumerate(chunk):
+                if not row or row[0].startswith('#'):
+                    continue
+                u = interned.get(row[0])
+                if u is None:
+                    label = row[0].strip()
+                    u = interned[row[0]] = interned.setdefault(label, label)
+                    graph.setdefault(u, [])
+                try:
+                    v = interned.get(row[1])
+                except IndexError:
+                    line = _line_number(path, delimiter, consumed + offset)
+                    raise ValueError(f"{path}:{line}: expected 'u,v' or 'u,v,weight', "
+                                     f"got {delimiter.join(row)!r}") from None
+                if v is None:
+                    label = row[1].strip()
+                    v = interned[row[1]] = interned.setdefault(label, label)
+                    graph.setdefault(v, [])
+                weight = 1
+                if len(row) > 2 and row[2].strip():
+                    try:
+                        weight = int(row[2])
+                    except ValueError:
+                        try:
+                            weight = float(row[2])
+                        except ValueError:
+                            line = _line_number(path, delimiter, consumed + offset)
+                            raise ValueError(f"{path}:{line}: weight {row[2]!r} "
+                                             f"is not a number") from None
+                
+                road = (u, v)
+                known = weights.get(road)
+                if known is None:
+                    graph[u].append(v)
+                    weights[road] = weight
+                    if not bidirectional:
+                        city._directed = True
+                elif weight < known:
+                    weights[road] = weight
+                if bidirectional:
+                    road = (v, u)
+                    known = weights.get(road)
+                    if known is None:
+                        graph[v].append(u)
+                        weights[road] = weight
+                    elif weight < known:
+                        weights[road] = weight
+            consumed += len(chunk)
+            city.version += 1
+    return city
+
+
+def _is_header(row):
+    """True for a column-name row such as "from,to,minutes" or "from,to"."""
+    if len(row) > 2 and row[2].strip():
+        try:
+            float(row[2])
+        except ValueError:
+            return True
+        return False
+    return len(row) > 1 and (row[0].strip().lower(), row[1].strip().lower()) in HEADER_COLUMNS
+
+
+def _line_number(path, delimiter, index):
+    """Line on which row index (0-based) of a CSV file ends, read again on error."""
+    with open(path, newline='') as f:
+        rows = csv.reader(f, delimiter=delimiter)
+        for _ in itertools.islice(rows, index + 1):
+            pass
+        return rows.line_num
+
+
+def load_snapshot(path):
+    """
+    Build a CityGraph from a binary edge file written by save_snapshot().
+    
+    Chunks are read as packed arrays, with no text parsing. Labels are
+    decoded as UTF-8 strings or with ast.literal_eval, never unpickled.
+    
+    Args:
+        path: Snapshot path
+        
+    Returns:
+        CityGraph
+    """
+    with open(path, 'rb') as f:
+        raw = f.read(EDGE_HEADER.size)
+        if len(raw) < EDGE_HEADER.size:
+            raise ValueError(f"{path}: file too short for an edge file header")
+        magic, version, flags, label_count, table_bytes, records = EDGE_HEADER.unpack(raw)
+        if magic != EDGE_MAGIC or version != EDGE_VERSION:
+            raise ValueError(f"{path}: not a version {EDGE_VERSION} edge file")
+        labels = _read_labels(f.read(table_bytes), label_count, path)
+        
+        city = CityGraph()
+        graph = city.graph = {label: [] for label in labels}
+        weights = city.weights
+        remaining = records
+        while remaining:
+            count, typecode = EDGE_CHUNK.unpack(f.read(EDGE_CHUNK.size))
+            if not 0 < count <= remaining or typecode not in (b'q', b'd'):
+                raise ValueError(f"{path}: corrupt edge chunk")
+            sources, targets, chunk_weights = array('i'), array('i'), array(typecode.decode())
+            try:
+                for block in (sources, targets, chunk_weights):
+                    block.fromfile(f, count)
+            except EOFError:
+                raise ValueError(f"{path}: truncated edge data") from None
+            if min(min(sources), min(targets)) < 0 or max(max(sources), max(targets)) >= label_count:
+                raise ValueError(f"{path}: node id out of range")
+            
+            roads = list(zip(map(labels.__getitem__, sources), map(labels.__getitem__, targets)))
+            if flags & EDGE_DEDUPLICATED:
+                # Snapshot: every road is new, so insert the chunk in bulk
+                weights.update(zip(roads, chunk_weights.tolist()))
+                for u, v in roads:
+                    graph[u].append(v)
+            else:
+                for road, weight in zip(roads, chunk_weights.tolist()):
+                    if road in weights:
+                        weights[road] = min(weights[road], weight)
+                    else:
+                        graph[road[0]].append(road[1])
+                        weights[road] = weight
+            remaining -= count
+    city._directed = bool(flags & EDGE_DIRECTED)
+    city.version = 1
+    return city
+
+
+def _label_table(labels):
+    """Encode labels for _read_labels(): tag bytes, uint32 lengths, UTF-8 text."""
+    tags, lengths, texts = bytearray(), array('I'), []
+    for label in labels:
+        if isinstance(label, str):
+            tags.append(EDGE_LABEL_STR)
+            text = label.encode()
+        else:
+            tags.append(EDGE_LABEL_LITERAL)
+            text = repr(label).encode()
+            try:
+                same = ast.literal_eval(text.decode()) == label
+            except (ValueError, SyntaxError):
+                same = False
+            if not same:
+                raise ValueError(f"cannot store node label {label!r} in a graph file")
+        lengths.append(len(text))
+        texts.append(text)
+    return bytes(tags) + lengths.tobytes() + b''.join(texts)
+
+
+def _read_array(f, typecode, count):
+    """array of count items read from f; raises EOFError if the file is short."""
+    block = array(typecode)
+    block.fromfile(f, count)
+    return block
+
+
+def _check_ids(ids, count, path):
+    """Return ids after checking every id is a valid index below count."""
+    if ids and (min(ids) < 0 or max(ids) >= count):
+        raise ValueError(f"{path}: node id out of range")
+    return ids
+
+
+def _read_labels(table, count, path):
+    """Decode the label table written by save_snapshot()."""
+    lengths = array('I')
+    if len(table) < count * (1 + lengths.itemsize):
+        raise ValueError(f"{path}: truncated label table")
+    tags = table[:count]
+    lengths.frombytes(table[count:count * (1 + lengths.itemsize)])
+    offset = count * (1 + lengths.itemsize)
+    if offset + sum(lengths) != len(table):
+        raise ValueError(f"{path}: corrupt label table")
+    labels = []
+    for tag, length in zip(tags, lengths):
+        text = table[offset:offset + length].decode()
+        offset += length
+        if tag == EDGE_LABEL_STR:
+            labels.append(text)
+        elif tag == EDGE_LABEL_LITERAL:
+            labels.append(ast.literal_eval(text))
+        else:
+            raise ValueError(f"{path}: unknown label type {tag}")
+    return labels
 
 
 def create_city_map():
@@ -7,28 +7,325 @@ value representing its "closeness" to the treasure. Implement Best-First Search
 locate the treasure.
 """
 
+from array import array
+from collections import deque
 import heapq
+import itertools
+import math
 import time
 import random
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; heuristic fields fall back to array()
+    np = None
+
+from assignment1_maze_solver import BitSet, CompactGrid, ComponentIndex
+
+HEURISTICS = ('manhattan', 'euclidean', 'chebyshev', 'octile')
+INT_FORMATS = frozenset('bBhHiIlLqQ')  # memoryview formats of integer fields
+
+
+class BucketQueue:
+    """
+    Priority queue for small non-negative int keys: one FIFO bucket per key.
+    
+    push is O(1). pop scans forward from the lowest non-empty bucket, which
+    is O(1) amortized when keys stay within a small range, as grid distance
+    heuristics do. Equal keys pop in insertion order.
+    """
+    
+    def __init__(self, max_key):
+        self._buckets = [None] * (max_key + 1)  # Deques created on first use
+        self._min = max_key + 1
+        self._size = 0
+    
+    def __len__(self):
+        return self._size
+    
+    def push(self, key, item):
+        bucket = self._buckets[key]
+        if bucket is None:
+            bucket = self._buckets[key] = deque()
+        bucket.append(item)
+        self._size += 1
+        if key < self._min:
+            self._min = key
+    
+    def pop(self):
+        """Remove and return (key, item) with the smallest key."""
+        key = self._min
+        while not self._buckets[key]:
+            key += 1
+        self._min = key
+        self._size -= 1
+        return key, self._buckets[key].popleft()
+
+
+class HeapQueue:
+    """
+    Binary-heap priority queue for any comparable keys (e.g. floats).
+    
+    Entries carry an insertion counter, so equal keys pop in insertion
+    order and items are never compared.
+    """
+    
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+    
+    def __len__(self):
+        return len(self._heap)
+    
+    def push(self, key, item):
+        heapq.heappush(self._heap, (key, next(self._counter), item))
+    
+    def pop(self):
+        """Remove and return (key, item) with the smallest key."""
+        key, _, item = heapq.heappop(self._heap)
+        return key, item
+
+
+class SearchStats:
+    """
+    Streaming statistics of the heuristic values a search expands, in O(1)
+    memory: count, mean, min, max, a fixed-bin histogram and the peak
+    open-list size.
+    
+    Any object with begin(high) and record(value, open_size) can be passed
+    to best_first_search(stats=...) instead.
+    """
+    
+    def __init__(self, bins=10, high=None):
+        """
+        Args:
+            bins: Number of equal-width histogram bins over [0, high)
+            high: Histogram upper bound (default: set by the search to
+                  the largest value in its heuristic field); larger values
+                  count in the last bin
+        """
+        self.bins = bins
+        self.high = high
+        self.histogram = [0] * bins
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.peak_open = 0
+    
+    def begin(self, high):
+        """Called by the search before the first record()."""
+        if self.high is None:
+            self.high = high
+    
+    def record(self, value, open_size):
+        """Add one expanded node's heuristic value and the open-list size."""
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if open_size > self.peak_open:
+            self.peak_open = open_size
+        bin_index = int(value * self.bins / self.high) if self.high else 0
+        self.histogram[min(max(bin_index, 0), self.bins - 1)] += 1
+    
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class TraceStats(SearchStats):
+    """SearchStats that also keeps every expanded heuristic value (opt-in, O(n) memory)."""
+    
+    def __init__(self, bins=10, high=None):
+        super().__init__(bins, high)
+        self.values = []
+    
+    def record(self, value, open_size):
+        super().record(value, open_size)
+        self.values.append(value)
+
+
+def field_bounds(field):
+    """(min, max) of a heuristic field, or (0, 0) if it is empty."""
+    if not len(field):
+        return 0, 0
+    if np is not None and isinstance(field, np.ndarray):
+        return field.min().item(), field.max().item()
+    return min(field), max(field)
+
+
+def make_priority_queue(field, bounds=None):
+    """
+    Queue suited to a heuristic field: a BucketQueue when every value is a
+    non-negative int no larger than the number of cells, else a HeapQueue.
+    
+    Args:
+        field: Flat heuristic field
+        bounds: (min, max) of the field if already known, e.g. from
+                TreasureHunt.heuristic_bounds(); otherwise it is scanned
+    """
+    if memoryview(field).format in INT_FORMATS and len(field):
+        low, high = bounds if bounds is not None else field_bounds(field)
+        if low >= 0 and high <= len(field):
+            return BucketQueue(high)
+    return HeapQueue()
+
 
 class TreasureHunt:
-    def __init__(self, grid_size, treasure_pos):
+    def __init__(self, grid_size, treasure_pos, grid=None):
         """
         Initialize the treasure hunt grid.
         
         Args:
             grid_size: Tuple (rows, cols) for grid dimensions
             treasure_pos: Tuple (row, col) for treasure location
+            grid: Optional existing grid (2D list, NumPy array or CompactGrid).
+                  When omitted, a grid with random obstacles is generated.
         """
         self.rows, self.cols = grid_size
+        self.custom_heuristics = {}  # name -> flat heuristic array from set_heuristic_field()
         self.treasure_pos = treasure_pos
         self.directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # Right, Down, Left, Up
         
+        if grid is not None:
+            self.grid = grid
+            return
+        
         # Create grid with some obstacles (0 = obstacle, 1 = walkable)
-        self.grid = [[1 for _ in range(self.cols)] for _ in range(self.rows)]
+        self.grid = CompactGrid(self.rows, self.cols, bytearray(b'\x01') * (self.rows * self.cols))
         self._add_random_obstacles()
     
+    @property
+    def grid(self):
+        return self._grid
+    
+    @grid.setter
+    def grid(self, grid):
+        shape = (self.rows, self.cols)
+        self._grid = CompactGrid.wrap(grid)
+        self.rows = self._grid.rows
+        self.cols = self._grid.cols
+        if (self.rows, self.cols) != shape:
+            self.custom_heuristics = {}  # Registered for the old dimensions
+        self.components = None  # A new grid invalidates any component index
+        self._heuristic_fields = {}
+        self._field_bounds = {}
+    
+    @property
+    def treasure_pos(self):
+        return self._treasure_pos
+    
+    @treasure_pos.setter
+    def treasure_pos(self, treasure_pos):
+        self._treasure_pos = tuple(treasure_pos)
+        self._heuristic_fields = {}  # Computed fields measure distance to the old spot
+        self._field_bounds = {}      # name -> (field, (min, max)) from heuristic_bounds()
+    
+    def heuristic_field(self, heuristic='manhattan'):
+        """
+        Heuristic value of every cell, as a flat row-major array.
+        
+        The whole grid is computed once per heuristic with NumPy broadcasting
+        (or array() without NumPy) and cached until the treasure or grid
+        changes. Manhattan and Chebyshev fields are int32; Euclidean and
+        octile fields are float32.
+        
+        Args:
+            heuristic: 'manhattan', 'euclidean', 'chebyshev', 'octile', or a
+                       name registered with set_heuristic_field()
+        """
+        if heuristic in self.custom_heuristics:
+            return self.custom_heuristics[heuristic]
+        if heuristic in self._heuristic_fields:
+            return self._heuristic_fields[heuristic]
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic {heuristic!r}; expected one of {HEURISTICS}")
+        
+        treasure_row, treasure_col = self.treasure_pos
+        if np is not None:
+            dr = np.abs(np.arange(self.rows, dtype=np.int32) - treasure_row)[:, None]
+            dc = np.abs(np.arange(self.cols, dtype=np.int32) - treasure_col)[None, :]
+            if heuristic == 'manhattan':
+                field = (dr + dc).astype(np.int32)
+            elif heuristic == 'chebyshev':
+                field = np.maximum(dr, dc).astype(np.int32)
+            elif heuristic == 'euclidean':
+                field = np.sqrt(dr * dr + dc * dc, dtype=np.float32)
+            else:
+                field = (np.maximum(dr, dc) + (math.sqrt(2) - 1) * np.minimum(dr, dc)).astype(np.float32)
+            field = field.ravel()
+        else:
+            cells = [(abs(row - treasure_row), abs(col - treasure_col))
+                     for row in range(self.rows) for col in range(self.cols)]
+            if heuristic == 'manhattan':
+                field = array('i', [dr + dc for dr, dc in cells])
+            elif heuristic == 'chebyshev':
+                field = array('i', [max(dr, dc) for dr, dc in cells])
+            elif heuristic == 'euclidean':
+                field = array('f', [math.sqrt(dr * dr + dc * dc) for dr, dc in cells])
+            else:
+                field = array('f', [max(dr, dc) + (math.sqrt(2) - 1) * min(dr, dc) for dr, dc in cells])
+        
+        self._heuristic_fields[heuristic] = field
+        return field
+    
+    def heuristic_bounds(self, heuristic='manhattan'):
+        """
+        (min, max) of heuristic_field(heuristic), scanned once per field and
+        cached with it, so each search picks its queue without a full scan.
+        """
+        field = self.heuristic_field(heuristic)
+        cached = self._field_bounds.get(heuristic)
+        if cached is None or cached[0] is not field:
+            cached = self._field_bounds[heuristic] = (field, field_bounds(field))
+        return cached[1]
+    
+    def set_heuristic_field(self, name, values):
+        """
+        Register a custom heuristic for best_first_search(start, heuristic=name).
+        
+        Args:
+            name: Heuristic name
+            values: rows x cols values (nested lists, NumPy array) or a flat
+                    row-major sequence. Custom fields are kept when the
+                    treasure moves; re-register them if they depend on it.
+                    A grid with other dimensions drops them.
+        """
+        if np is not None:
+            field = np.ascontiguousarray(values).ravel()
+            if field.dtype.kind not in 'iuf':
+                raise ValueError("heuristic values must be numbers")
+            if field.dtype.kind != 'f':
+                field = field.astype(np.int32)
+            elif field.dtype != np.float64:
+                field = field.astype(np.float32)
+        else:
+            flat = list(values)
+            if flat and isinstance(flat[0], (list, tuple)):
+                flat = [value for row in flat for value in row]
+            field = array('i' if all(isinstance(value, int) for value in flat) else 'd', flat)
+        if len(field) != self.rows * self.cols:
+            raise ValueError(f"Expected {self.rows * self.cols} heuristic values, got {len(field)}")
+        self.custom_heuristics[name] = field
+    
+    def build_component_index(self):
+        """
+        Precompute connected-component labels so a treasure in another region
+        is rejected immediately. Use set_cell() for later edits.
+        """
+        self.components = ComponentIndex(self._grid)
+        return self.components
+    
+    def set_cell(self, row, col, value):
+        """Set a cell to obstacle (0) or walkable (1), keeping the component index current."""
+        if self.components is not None:
+            self.components.set_cell(row, col, value)
+        else:
+            self._grid[row][col] = 1 if value else 0
+    
     def _add_random_obstacles(self, obstacle_ratio=0.2):
         """Add random obstacles to the grid."""
         num_obstacles = int(self.rows * self.cols * obstacle_ratio)
@@ -56,82 +353,91 @@ class TreasureHunt:
         return ((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)**0.5
     
     def is_valid(self, row, col, visited):
-        """Check if a cell is valid to visit."""
-        return (0 <= row < self.rows and 
-                0 <= col < self.cols and 
-                self.grid[row][col] == 1 and 
-                not visited[row][col])
+        """Check if a cell is valid to visit (visited is a BitSet of flat indices)."""
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        index = row * self.cols + col
+        return self._grid.cells[index] == 1 and index not in visited
     
-    def best_first_search(self, start, heuristic='manhattan'):
+    def best_first_search(self, start, heuristic='manhattan', stats=None):
         """
         Best-First Search using a heuristic function.
         Always moves to the most promising cell first (minimum heuristic value).
         
         Args:
             start: Tuple (row, col) for start position
-            heuristic: 'manhattan' or 'euclidean' distance
+            heuristic: 'manhattan', 'euclidean', 'chebyshev', 'octile' or a
+                       custom field name (see heuristic_field)
+            stats: Optional collector such as SearchStats (or TraceStats
+                   for the full list of expanded values); without one the
+                   search records nothing
             
         Returns:
-            Tuple (path, nodes_explored, heuristic_values)
+            Tuple (path, nodes_explored, stats)
         """
-        if heuristic == 'manhattan':
-            heuristic_func = self.manhattan_distance
-        else:
-            heuristic_func = self.euclidean_distance
+        # Cached whole-grid field, read by flat index in the loop
+        field = self.heuristic_field(heuristic)
+        bounds = self.heuristic_bounds(heuristic)
+        h_field = memoryview(field)
+        
+        if self.components is not None and not self.components.connected(start, self.treasure_pos):
+            return None, 0, stats
         
-        visited = [[False] * self.cols for _ in range(self.rows)]
-        parent = [[None] * self.cols for _ in range(self.rows)]
+        grid = self._grid
+        cols = self.cols
+        visited = BitSet(self.rows * cols)
+        parent = grid.new_parents()
+        start_index = grid.index(*start)
+        treasure_index = grid.index(*self.treasure_pos)
         
-        # Priority queue: (heuristic_value, position)
-        pq = [(heuristic_func(start, self.treasure_pos), start)]
-        visited[start[0]][start[1]] = True
+        # Bucket queue for int heuristics, binary heap for float ones; equal
+        # heuristic values pop in the order they were pushed
+        pq = make_priority_queue(field, bounds)
+        pq.push(h_field[start_index], start_index)
+        visited.add(start_index)
         
         nodes_explored = 0
-        heuristic_values = []
+        if stats is not None:
+            stats.begin(bounds[1])
         
         while pq:
-            h_value, (row, col) = heapq.heappop(pq)
+            h_value, index = pq.pop()
             nodes_explored += 1
-            heuristic_values.append(h_value)
+            if stats is not None:
+                stats.record(h_value, len(pq) + 1)  # Open-list size before this pop
             
             # Check if we found the treasure
-            if (row, col) == self.treasure_pos:
-                # Reconstruct path
-                path = []
-                current = self.treasure_pos
-                while current is not None:
-                    path.append(current)
-                    current = parent[current[0]][current[1]]
-                path.reverse()
-                return path, nodes_explored, heuristic_values
+            if index == treasure_index:
+                return grid.trace_path(parent, index), nodes_explored, stats
             
             # Explore neighbors
+            row, col = divmod(index, cols)
             for dr, dc in self.directions:
                 new_row, new_col = row + dr, col + dc
                 
                 if self.is_valid(new_row, new_col, visited):
-                    visited[new_row][new_col] = True
-                    parent[new_row][new_col] = (row, col)
+                    new_index = new_row * cols + new_col
+                    visited.add(new_index)
+                    parent[new_index] = index
                     
-                    # Calculate heuristic for new position
-                    h = heuristic_func((new_row, new_col), self.treasure_pos)
-                    heapq.heappush(pq, (h, (new_row, new_col)))
+                    pq.push(h_field[new_index], new_index)
         
-        return None, nodes_explored, heuristic_values
+        return None, nodes_explored, stats
     
     def greedy_best_first(self, start):
         """
         Greedy Best-First Search (always picks the neighbor with lowest heuristic).
         This is a simpler version that doesn't use a priority queue.
         """
-        visited = [[False] * self.cols for _ in range(self.rows)]
+        visited = BitSet(self.rows * self.cols)
+        h_field = memoryview(self.heuristic_field('manhattan'))
         path = [start]
         current = start
         nodes_explored = 0
         
         while current != self.treasure_pos:
             row, col = current
-            visited[row][col] = True
+            visited.add(row * self.cols + col)
             nodes_explored += 1
             
             # Find the best neighbor
@@ -142,7 +448,7 @@ class TreasureHunt:
                 new_row, new_col = row + dr, col + dc
                 
                 if self.is_valid(new_row, new_col, visited):
-                    h = self.manhattan_distance((new_row, new_col), self.treasure_pos)
+                    h = h_field[new_row * self.cols + new_col]
                     if h < best_heuristic:
                         best_heuristic = h
                         best_neighbor = (new_row, new_col)
@@ -194,7 +500,7 @@ def compare_heuristics(grid_size, treasure_pos, start):
         hunt = TreasureHunt(grid_size, treasure_pos)
         
         start_time = time.time()
-        path, nodes, h_values = hunt.best_first_search(start, heuristic)
+        path, nodes, stats = hunt.best_first_search(start, heuristic, stats=SearchStats())
         elapsed = time.time() - start_time
         
         results.append({
@@ -202,7 +508,7 @@ def compare_heuristics(grid_size, treasure_pos, start):
             'path': path,
             'nodes': nodes,
             'time': elapsed,
-            'h_values': h_values
+            'stats': stats
         })
         
         print(f"\n{heuristic.upper()} Distance Heuristic:")
@@ -211,7 +517,7 @@ def compare_heuristics(grid_size, treasure_pos, start):
             print(f"  Path length: {len(path)} steps")
             print(f"  Nodes explored: {nodes}")
             print(f"  Time: {elapsed:.6f} seconds")
-            print(f"  Average heuristic value: {sum(h_values)/len(h_values):.2f}")
+            print(f"  Average heuristic value: {stats.mean:.2f}")
             hunt.visualize_search(path, f"Best-First ({heuristic})", start)
     
     return results
@@ -243,7 +549,7 @@ def main():
     print("1. BEST-FIRST SEARCH (Manhattan Distance)")
     print("-" * 70)
     start_time = time.time()
-    bfs_path, bfs_nodes, bfs_h_values = hunt.best_first_search(start, 'manhattan')
+    bfs_path, bfs_nodes, _ = hunt.best_first_search(start, 'manhattan')
     bfs_time = time.time() - start_time
     
     if bfs_path:
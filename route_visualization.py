@@ -0,0 +1,186 @@
+"""
+Visualization for Assignment 2: draw a CityGraph and a route with NetworkX
+and Matplotlib.
+
+Kept apart from assignment2_route_finder so that route search does not
+import the plotting stack. matplotlib and networkx are imported only when
+a drawing is requested.
+
+Layouts are cached per graph and reused until the graph's version changes,
+so drawing several routes on one map computes the spring layout once.
+Nodes that are (x, y) number pairs, or nodes given explicit positions, are
+drawn at those coordinates without any layout step. With hops=k only the
+k-hop neighbourhood of the route is drawn, so the cost of drawing a route
+depends on the route, not on the size of the map.
+"""
+
+from collections import deque
+from numbers import Real
+import weakref
+
+LABEL_LIMIT = 200  # Draw node labels only for drawings with at most this many nodes
+
+_layouts = weakref.WeakKeyDictionary()  # CityGraph -> (version, positions)
+
+
+def _has_coordinates(node):
+    return (isinstance(node, tuple) and len(node) == 2
+            and all(isinstance(value, Real) for value in node))
+
+
+def graph_layout(city, positions=None):
+    """
+    Positions for every node of a CityGraph.
+
+    Args:
+        city: CityGraph to lay out
+        positions: Optional dict node -> (x, y); nodes without a position
+                   are placed by a spring layout around the fixed ones
+
+    Returns:
+        Dict node -> (x, y). Spring layouts without given positions are
+        cached until city.version changes.
+    """
+    if positions is not None and all(node in positions for node in city.graph):
+        return positions
+    if all(_has_coordinates(node) for node in city.graph):
+        return {node: node for node in city.graph}
+    if positions:
+        return _spring_layout(city, set(city.graph), positions)
+
+    version, cached = _layouts.get(city, (None, None))
+    if version != city.version:
+        cached = _spring_layout(city, set(city.graph), None)
+        _layouts[city] = (city.version, cached)
+    return cached
+
+
+def _spring_layout(city, nodes, positions):
+    """networkx spring layout of the roads between the given nodes."""
+    import networkx as nx
+
+    G = nx.Graph()
+    G.add_nodes_from(nodes)
+    for node in nodes:
+        for neighbor in city.graph[node]:
+            if neighbor in nodes:
+                G.add_edge(node, neighbor)
+    fixed = {node: positions[node] for node in nodes if positions and node in positions}
+    return nx.spring_layout(G, k=2, iterations=50, pos=fixed or None, fixed=list(fixed) or None)
+
+
+def path_neighbourhood(city, path, hops):
+    """Nodes within hops roads of any node on the path."""
+    depth = dict.fromkeys(path, 0)
+    queue = deque(path)
+    while queue:
+        node = queue.popleft()
+        if depth[node] == hops:
+            continue
+        for neighbor in city.graph.get(node, []):
+            if neighbor not in depth:
+                depth[neighbor] = depth[node] + 1
+                queue.append(neighbor)
+    return set(depth)
+
+
+def _neighbourhood_layout(city, nodes, positions):
+    """Positions for a neighbourhood, without laying out the whole graph."""
+    if positions is not None and all(node in positions for node in nodes):
+        return positions
+    if all(_has_coordinates(node) for node in nodes):
+        return {node: node for node in nodes}
+    version, cached = _layouts.get(city, (None, None))
+    if not positions and version == city.version:
+        return cached
+    return _spring_layout(city, nodes, positions)
+
+
+def road_segments(city, nodes, pos):
+    """
+    Line segments for the roads between the given nodes. Each road gives
+    one segment, whatever its direction or number of parallel copies.
+    """
+    drawn = set()
+    segments = []
+    for node in nodes:
+        for neighbor in city.graph[node]:
+            road = frozenset((node, neighbor))
+            if neighbor in nodes and road not in drawn:
+                drawn.add(road)
+                segments.append((pos[node], pos[neighbor]))
+    return segments
+
+
+def visualize_graph(city, path=None, algorithm_name="Graph", explored_nodes=None,
+                    hops=None, positions=None, dpi=300):
+    """
+    Draw a CityGraph, highlighting a path, and save it as a PNG.
+
+    Args:
+        city: CityGraph to draw
+        path: Optional list of nodes to highlight
+        algorithm_name: Title, also used for the file name
+        explored_nodes: Unused, kept for the CityGraph.visualize_graph signature
+        hops: If set (and a path is given), draw only nodes within this many
+              roads of the path
+        positions: Optional dict node -> (x, y) of known coordinates
+        dpi: Resolution of the saved image
+    """
+    try:
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
+
+        if path and hops is not None:
+            nodes = path_neighbourhood(city, path, hops)
+            pos = _neighbourhood_layout(city, nodes, positions)
+        else:
+            nodes = set(city.graph)
+            pos = graph_layout(city, positions)
+
+        # One batched collection for all roads
+        fig, ax = plt.subplots(figsize=(12, 8))
+        ax.add_collection(LineCollection(road_segments(city, nodes, pos),
+                                         colors='black', alpha=0.2, zorder=1))
+
+        def draw_nodes(group, color, size, alpha):
+            if not group:
+                return
+            xs, ys = zip(*(pos[node] for node in group))
+            ax.scatter(xs, ys, s=size, c=color, alpha=alpha, zorder=2)
+
+        # Draw all nodes
+        draw_nodes(nodes, 'lightblue', 500, 0.6)
+
+        # Highlight path if provided
+        if path:
+            path_segments = [(pos[path[i]], pos[path[i+1]]) for i in range(len(path)-1)]
+            ax.add_collection(LineCollection(path_segments, colors='red', linewidths=3,
+                                             alpha=0.8, zorder=1))
+
+            # Highlight path nodes, then start and end
+            draw_nodes(path, 'orange', 600, 0.9)
+            draw_nodes([path[0]], 'green', 700, 1)
+            draw_nodes([path[-1]], 'red', 700, 1)
+
+        # Draw labels
+        if len(nodes) <= LABEL_LIMIT:
+            for node in nodes:
+                x, y = pos[node]
+                ax.text(x, y, str(node), fontsize=10, fontweight='bold',
+                        ha='center', va='center', zorder=3)
+
+        ax.autoscale()
+        ax.set_title(f"{algorithm_name} - Path Visualization", fontsize=16, fontweight='bold')
+        ax.axis('off')
+        fig.tight_layout()
+
+        # Save the figure
+        filename = f"{algorithm_name.lower().replace(' ', '_')}_visualization.png"
+        fig.savefig(filename, dpi=dpi, bbox_inches='tight')
+        print(f"Visualization saved as: {filename}")
+        plt.close(fig)
+
+    except Exception as e:
+        print(f"Visualization requires matplotlib and networkx: {e}")
+        print("Install with: pip install matplotlib networkx")
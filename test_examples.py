@@ -3,9 +3,18 @@ Test Examples for AI Search Algorithms
 This file contains additional test cases and examples for all three assignments.
 """
 
-from assignment1_maze_solver import MazeSolver
-from assignment2_route_finder import CityGraph
-from assignment3_treasure_hunt import TreasureHunt
+import os
+import subprocess
+import sys
+import tempfile
+
+from assignment1_maze_solver import (CompactGrid, HierarchicalPathfinder, LPAStarPlanner,
+                                     MazeSolver, load_maze, read_maze_header, save_maze)
+from assignment2_route_finder import (CityGraph, ContractionHierarchy, create_city_map,
+                                     load_edge_list, load_snapshot, save_snapshot)
+from assignment3_treasure_hunt import (BucketQueue, HeapQueue, SearchStats, TraceStats, TreasureHunt,
+                                       make_priority_queue)
+from route_visualization import graph_layout, path_neighbourhood, road_segments
 
 
 def test_assignment1_small_maze():
@@ -92,6 +101,313 @@ def test_assignment1_large_maze():
     print(f"Efficiency: BFS found path {((len(dfs_path) - len(bfs_path)) / len(dfs_path) * 100):.1f}% shorter")
 
 
+def test_assignment1_compact_grid():
+    """Test Assignment 1 with the compact one-byte-per-cell grid backend."""
+    print("\n" + "="*60)
+    print("TEST: Compact Grid Storage")
+    print("="*60)
+    
+    maze = [
+        [1, 1, 0, 1, 1],
+        [0, 1, 1, 1, 0],
+        [0, 0, 0, 1, 0],
+        [1, 1, 1, 1, 0],
+        [0, 0, 0, 1, 1]
+    ]
+    
+    grid = CompactGrid.from_lists(maze)
+    assert len(grid.cells) == 25
+    assert grid.to_lists() == maze
+    
+    list_path, list_nodes = MazeSolver(maze).bfs((0, 0), (4, 4))
+    grid_path, grid_nodes = MazeSolver(grid).bfs((0, 0), (4, 4))
+    assert (list_path, list_nodes) == (grid_path, grid_nodes)
+    
+    # Rows are writable views into the shared cell buffer
+    grid[2][3] = 0
+    assert MazeSolver(grid).bfs((0, 0), (4, 4))[0] is None
+    
+    print(f"Cells stored in {len(grid.cells)} bytes, BFS path length = {len(grid_path)}")
+
+
+def test_assignment1_long_corridor():
+    """Test Assignment 1 DFS on a corridor far deeper than the recursion limit."""
+    print("\n" + "="*60)
+    print("TEST: Long Corridor (5000x1)")
+    print("="*60)
+    
+    corridor = [[1] for _ in range(5000)]
+    solver = MazeSolver(corridor)
+    
+    dfs_path, dfs_nodes = solver.dfs((0, 0), (4999, 0))
+    
+    assert len(dfs_path) == 5000 and dfs_nodes == 5000
+    print(f"DFS: Path length = {len(dfs_path)}, Nodes explored = {dfs_nodes}")
+
+
+def test_assignment1_component_index():
+    """Test Assignment 1 instant rejection with a connected-component index."""
+    print("\n" + "="*60)
+    print("TEST: Component Index on Unsolvable Maze")
+    print("="*60)
+    
+    unsolvable_maze = [
+        [1, 1, 0, 1, 1],
+        [0, 1, 0, 1, 0],
+        [0, 0, 0, 0, 0],  # Wall blocking path
+        [1, 1, 0, 1, 1],
+        [0, 0, 0, 0, 1]
+    ]
+    
+    solver = MazeSolver(unsolvable_maze)
+    index = solver.build_component_index()
+    
+    assert solver.bfs((0, 0), (4, 4)) == (None, 0)
+    assert solver.dfs((0, 0), (4, 4)) == (None, 0)
+    
+    # Open a gap in the wall and the index merges the regions incrementally
+    solver.set_cell(1, 2, 1)
+    solver.set_cell(2, 3, 1)
+    solver.set_cell(3, 2, 1)
+    assert index.connected((0, 0), (3, 4))
+    assert solver.bfs((0, 0), (3, 4))[0] is not None
+    
+    # Closing it again splits them
+    solver.set_cell(2, 3, 0)
+    assert solver.bfs((0, 0), (3, 4)) == (None, 0)
+    
+    print(f"Components: {index.component_count}, unreachable queries rejected with 0 nodes explored")
+
+
+def test_assignment1_batch_queries():
+    """Test Assignment 1 batch queries sharing one search tree per source."""
+    print("\n" + "="*60)
+    print("TEST: Batch Queries (one-to-many and many-to-one)")
+    print("="*60)
+    
+    maze = [[1 for _ in range(20)] for _ in range(20)]
+    for i in range(2, 18):
+        maze[i][10] = 0
+    solver = MazeSolver(maze)
+    
+    one_to_many = [((0, 0), (19, 19)), ((0, 0), (5, 15)), ((0, 0), (10, 3))]
+    results = solver.batch_bfs(one_to_many)
+    for (start, end), result in zip(one_to_many, results):
+        assert result == solver.bfs(start, end)
+    
+    many_to_one = [((19, 0), (0, 19)), ((10, 5), (0, 19)), ((0, 0), (0, 19))]
+    results = solver.batch_bfs(many_to_one)
+    for (start, end), (path, _) in zip(many_to_one, results):
+        assert path[0] == start and path[-1] == end
+        assert len(path) == len(solver.bfs(start, end)[0])
+    
+    tree = solver.bfs_tree((0, 0))
+    assert tree.distance_to((19, 19)) == 38
+    print(f"Answered {len(one_to_many) + len(many_to_one)} queries with 2 searches")
+
+
+def test_assignment1_incremental_replanning():
+    """Test Assignment 1 LPA* replanning after doors open and close."""
+    print("\n" + "="*60)
+    print("TEST: Incremental Replanning (LPA*)")
+    print("="*60)
+    
+    maze = [[1 for _ in range(30)] for _ in range(30)]
+    for i in range(30):
+        maze[i][15] = 0
+    maze[5][15] = 1  # Door
+    
+    solver = MazeSolver(maze)
+    planner = LPAStarPlanner(solver.maze, (0, 0), (29, 29))
+    
+    path, first_nodes = planner.plan()
+    assert len(path) == len(solver.bfs((0, 0), (29, 29))[0])
+    
+    # Close the door and open another one further down
+    planner.set_wall(5, 15)
+    planner.clear_wall(25, 15)
+    path, replan_nodes = planner.plan()
+    bfs_path, bfs_nodes = solver.bfs((0, 0), (29, 29))
+    assert len(path) == len(bfs_path)
+    
+    # A change off the shortest path needs almost no work
+    planner.set_wall(0, 29)
+    path, small_nodes = planner.plan()
+    assert len(path) == len(bfs_path) and small_nodes < bfs_nodes
+    
+    print(f"Initial plan: {first_nodes} nodes, door moved: {replan_nodes} nodes, "
+          f"minor change: {small_nodes} nodes (full BFS: {bfs_nodes})")
+
+
+def test_assignment1_corridor_graph():
+    """Test Assignment 1 search over a corridor-compressed graph."""
+    print("\n" + "="*60)
+    print("TEST: Corridor-Compressed Graph (serpentine maze)")
+    print("="*60)
+    
+    # Serpentine maze: long corridors joined by single turns
+    maze = [[0 for _ in range(21)] for _ in range(21)]
+    for i in range(0, 21, 2):
+        for j in range(21):
+            maze[i][j] = 1
+        maze[i + 1 if i < 20 else i][20 if i % 4 == 0 else 0] = 1
+    
+    solver = MazeSolver(maze)
+    corridors = solver.compress_corridors()
+    
+    bfs_path, bfs_nodes = solver.bfs((0, 0), (20, 10))
+    graph_path, graph_nodes = corridors.shortest_path((0, 0), (20, 10))
+    
+    assert graph_path == bfs_path
+    assert graph_nodes * 5 < bfs_nodes
+    
+    print(f"Graph nodes: {corridors.num_nodes} (maze cells: {sum(map(sum, maze))})")
+    print(f"BFS: Nodes = {bfs_nodes}, Corridor graph: Nodes = {graph_nodes}, Path length = {len(graph_path)}")
+
+
+def test_assignment1_hierarchical():
+    """Test Assignment 1 hierarchical pathfinding (HPA*) on a 60x60 grid."""
+    print("\n" + "="*60)
+    print("TEST: Hierarchical Pathfinding (HPA*)")
+    print("="*60)
+    
+    grid = [[1 for _ in range(60)] for _ in range(60)]
+    for i in range(0, 50):
+        grid[i][30] = 0
+    
+    solver = MazeSolver(grid)
+    hierarchy = HierarchicalPathfinder(solver.maze, cluster_size=10)
+    
+    path, abstract_nodes, refined_nodes = hierarchy.search((0, 0), (0, 59))
+    bfs_path, bfs_nodes = solver.bfs((0, 0), (0, 59))
+    assert path[0] == (0, 0) and path[-1] == (0, 59)
+    assert len(path) <= 1.2 * len(bfs_path)
+    assert abstract_nodes + refined_nodes < bfs_nodes
+    
+    # Close the gap under the wall; only the touched cluster is rebuilt
+    for col in range(20, 30):
+        hierarchy.set_cell(55, col, 0)
+    for row in range(50, 60):
+        hierarchy.set_cell(row, 30, 0)
+    assert hierarchy.search((0, 0), (0, 59))[0] is None
+    
+    print(f"Abstract nodes: {hierarchy.num_abstract_nodes}")
+    print(f"HPA*: Path length = {len(path)}, Abstract = {abstract_nodes}, Refined = {refined_nodes}")
+    print(f"BFS: Path length = {len(bfs_path)}, Nodes = {bfs_nodes}")
+
+
+def test_assignment1_distance_field():
+    """Test Assignment 1 NumPy distance field against BFS."""
+    print("\n" + "="*60)
+    print("TEST: NumPy Distance Field (20x20)")
+    print("="*60)
+    
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("Skipped: requires numpy")
+        return
+    
+    maze = [[1 for _ in range(20)] for _ in range(20)]
+    for i in range(2, 18):
+        maze[i][5] = 0
+        maze[i][15] = 0
+    
+    solver = MazeSolver(maze)
+    distance, parent_direction = solver.distance_field((0, 0))
+    tree = solver.bfs_tree((0, 0))
+    
+    assert list(distance.ravel()) == list(tree.distance)
+    path = solver.path_from_field(distance, parent_direction, (19, 19))
+    assert len(path) == len(solver.bfs((0, 0), (19, 19))[0])
+    
+    print(f"Farthest cell: {distance.max()} steps, path to (19, 19): {len(path)} cells")
+
+
+def test_assignment1_maze_file():
+    """Test Assignment 1 binary maze files (save, memory-mapped load)."""
+    print("\n" + "="*60)
+    print("TEST: Binary Maze File Round Trip")
+    print("="*60)
+    
+    maze = [
+        [1, 1, 0, 1, 1],
+        [0, 1, 1, 1, 0],
+        [0, 0, 0, 1, 0],
+        [1, 1, 1, 1, 0],
+        [0, 0, 0, 1, 1]
+    ]
+    expected = MazeSolver(maze).bfs((0, 0), (4, 4))
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for bit_depth in (8, 1):
+            path = os.path.join(directory, f"maze{bit_depth}.maze")
+            save_maze(path, maze, bit_depth=bit_depth)
+            
+            header = read_maze_header(path)
+            assert (header.rows, header.cols, header.bit_depth) == (5, 5, bit_depth)
+            grid = load_maze(path)
+            assert grid.to_lists() == maze
+            assert MazeSolver(grid).bfs((0, 0), (4, 4)) == expected
+            
+            print(f"Bit depth {bit_depth}: {os.path.getsize(path)} bytes on disk")
+            del grid
+        
+        # Copy-on-write needs only read access; edits stay in memory
+        read_only = os.path.join(directory, "maze8.maze")
+        os.chmod(read_only, 0o444)
+        grid = load_maze(read_only, mode='c')
+        grid[0][0] = 0
+        assert grid[0][0] == 0 and load_maze(read_only).to_lists() == maze
+        del grid
+        
+        # Packed cells live in memory only, so 'r+' cannot write them back
+        try:
+            load_maze(path, mode='r+')
+            assert False, "mode 'r+' accepted for a bit-packed maze"
+        except ValueError:
+            pass
+        
+        # A packed file missing its last byte is rejected, not zero-filled
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 1)
+        try:
+            load_maze(path)
+            assert False, "truncated maze accepted"
+        except ValueError:
+            pass
+
+
+def test_assignment1_astar_and_jps():
+    """Test Assignment 1 A* and Jump Point Search against BFS."""
+    print("\n" + "="*60)
+    print("TEST: A* and Jump Point Search (open 40x40 room)")
+    print("="*60)
+    
+    room = [[1 for _ in range(40)] for _ in range(40)]
+    for i in range(5, 35):
+        room[i][20] = 0
+    
+    solver = MazeSolver(room)
+    start = (20, 0)
+    end = (20, 39)
+    
+    bfs_path, bfs_nodes = solver.bfs(start, end)
+    astar_path, astar_nodes = solver.a_star(start, end)
+    jps_path, jps_nodes = solver.jump_point_search(start, end)
+    jps8_path, jps8_nodes = solver.jump_point_search(start, end, diagonal=True)
+    astar8_path, astar8_nodes = solver.a_star(start, end, diagonal=True)
+    
+    assert len(bfs_path) == len(astar_path) == len(jps_path)
+    assert len(jps8_path) == len(astar8_path)
+    assert jps_nodes < astar_nodes < bfs_nodes
+    
+    print(f"BFS: Path length = {len(bfs_path)}, Nodes = {bfs_nodes}")
+    print(f"A*: Path length = {len(astar_path)}, Nodes = {astar_nodes}")
+    print(f"JPS: Path length = {len(jps_path)}, Jump points = {jps_nodes}")
+    print(f"JPS (8-connected): Path length = {len(jps8_path)}, Jump points = {jps8_nodes}")
+
+
 def test_assignment2_simple_graph():
     """Test Assignment 2 with a simple linear graph."""
     print("\n" + "="*60)
@@ -147,6 +463,456 @@ def test_assignment2_complex_graph():
     print(f"Bi-BFS: Path length = {len(bidirectional_path)}, Nodes = {bidirectional_nodes}")
 
 
+def test_assignment2_deep_graph():
+    """Test Assignment 2 DFS on a chain far deeper than the recursion limit."""
+    print("\n" + "="*60)
+    print("TEST: Deep Chain Graph (5000 nodes)")
+    print("="*60)
+    
+    city = CityGraph()
+    for i in range(4999):
+        city.add_edge(i, i + 1)
+    
+    dfs_path, dfs_nodes = city.dfs(0, 4999)
+    
+    assert dfs_path == list(range(5000)) and dfs_nodes == 5000
+    print(f"DFS: Path length = {len(dfs_path)}, Nodes = {dfs_nodes}")
+
+
+def test_assignment2_bounded_bfs():
+    """Test Assignment 2 BFS peak frontier reporting and frontier cap."""
+    print("\n" + "="*60)
+    print("TEST: Memory-Bounded BFS (star of chains)")
+    print("="*60)
+    
+    city = CityGraph()
+    # Hub with 50 spokes of length 3; the target sits at the end of one spoke
+    for spoke in range(50):
+        city.add_edge('hub', (spoke, 0))
+        city.add_edge((spoke, 0), (spoke, 1))
+        city.add_edge((spoke, 1), (spoke, 2))
+    
+    path, nodes, peak, truncated = city.bounded_bfs('hub', (49, 2))
+    assert (path, nodes) == city.bfs('hub', (49, 2))
+    assert peak == 50 and not truncated
+    
+    capped_path, _, capped_peak, truncated = city.bounded_bfs('hub', (49, 2), max_frontier=10)
+    assert capped_path is None and capped_peak > 10 and truncated
+    
+    # An unreachable target is a finished search, not a truncated one
+    city.add_edge('island', 'shore')
+    no_path, _, _, truncated = city.bounded_bfs('hub', 'island', max_frontier=100)
+    assert no_path is None and not truncated
+    
+    print(f"Path length = {len(path)}, Nodes = {nodes}, Peak frontier = {peak}")
+
+
+def test_assignment2_weighted_graph():
+    """Test Assignment 2 Dijkstra and bi-directional Dijkstra on weighted roads."""
+    print("\n" + "="*60)
+    print("TEST: Weighted Roads (Dijkstra)")
+    print("="*60)
+    
+    city = CityGraph()
+    # A direct but slow highway A-E versus a chain of short streets
+    roads = [('A', 'E', 20), ('A', 'B', 2), ('B', 'C', 2), ('C', 'D', 2),
+             ('D', 'E', 2), ('B', 'F', 1), ('F', 'G', 9), ('G', 'E', 1)]
+    for u, v, weight in roads:
+        city.add_edge(u, v, weight=weight)
+    
+    bfs_path, bfs_nodes = city.bfs('A', 'E')
+    dijkstra_path, dijkstra_settled = city.dijkstra('A', 'E')
+    bidirectional_path, bidirectional_settled = city.bidirectional_dijkstra('A', 'E')
+    
+    assert bfs_path == ['A', 'E']
+    assert dijkstra_path == ['A', 'B', 'C', 'D', 'E']
+    assert bidirectional_path == dijkstra_path
+    
+    print(f"BFS (hops): {' -> '.join(bfs_path)}, Nodes = {bfs_nodes}")
+    print(f"Dijkstra: {' -> '.join(dijkstra_path)}, Settled = {dijkstra_settled}")
+    print(f"Bi-Dijkstra: {' -> '.join(bidirectional_path)}, Settled = {bidirectional_settled}")
+
+
+def test_assignment2_contraction_hierarchy():
+    """Test Assignment 2 contraction hierarchy queries against Dijkstra."""
+    print("\n" + "="*60)
+    print("TEST: Contraction Hierarchy (12x12 street grid)")
+    print("="*60)
+    
+    city = CityGraph()
+    for i in range(12):
+        for j in range(12):
+            if i + 1 < 12:
+                city.add_edge((i, j), (i + 1, j), weight=1 + (i * j) % 4)
+            if j + 1 < 12:
+                city.add_edge((i, j), (i, j + 1), weight=1 + (i + j) % 3)
+    
+    hierarchy = ContractionHierarchy.build(city)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "city.ch")
+        hierarchy.save(path)
+        loaded = ContractionHierarchy.load(path)
+        assert loaded.labels == hierarchy.labels and loaded.middle == hierarchy.middle
+        assert loaded.up_forward == hierarchy.up_forward and loaded.up_backward == hierarchy.up_backward
+        hierarchy = loaded
+        
+        # A cut-off file is rejected instead of loading part of the hierarchy
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 1)
+        try:
+            ContractionHierarchy.load(path)
+            assert False, "truncated hierarchy accepted"
+        except ValueError:
+            pass
+    
+    def route_cost(route):
+        return sum(city.weights[(u, v)] for u, v in zip(route, route[1:]))
+    
+    for start, end in [((0, 0), (11, 11)), ((0, 11), (11, 0)), ((5, 3), (2, 9))]:
+        dijkstra_path, dijkstra_settled = city.dijkstra(start, end)
+        ch_path, ch_settled = hierarchy.query(start, end)
+        assert ch_path[0] == start and ch_path[-1] == end
+        assert route_cost(ch_path) == route_cost(dijkstra_path)
+        print(f"{start} -> {end}: cost = {route_cost(ch_path)}, "
+              f"Dijkstra settled = {dijkstra_settled}, CH settled = {ch_settled}")
+    
+    print(f"Shortcuts added: {hierarchy.num_shortcuts}")
+
+
+def test_assignment2_alt_landmarks():
+    """Test Assignment 2 ALT landmark A* against Dijkstra."""
+    print("\n" + "="*60)
+    print("TEST: ALT Landmark A* (15x15 street grid)")
+    print("="*60)
+    
+    city = CityGraph()
+    for i in range(15):
+        for j in range(15):
+            if i + 1 < 15:
+                city.add_edge((i, j), (i + 1, j), weight=1 + (i * j) % 5)
+            if j + 1 < 15:
+                city.add_edge((i, j), (i, j + 1), weight=1 + (i + 2 * j) % 4)
+    
+    def route_cost(route):
+        return sum(city.weights[(u, v)] for u, v in zip(route, route[1:]))
+    
+    for strategy in ('farthest', 'avoid'):
+        city.build_landmarks(num_landmarks=4, strategy=strategy)
+        dijkstra_path, _ = city.dijkstra((0, 0), (14, 14))
+        path, settled, stats = city.alt_astar((0, 0), (14, 14), compare=True)
+        bi_path, bi_settled, _ = city.alt_astar((0, 0), (14, 14), bidirectional=True)
+        
+        assert route_cost(path) == route_cost(bi_path) == route_cost(dijkstra_path)
+        assert settled < stats['dijkstra_settled']
+        print(f"{strategy}: A* settled = {settled}, Bi-A* settled = {bi_settled}, "
+              f"Dijkstra settled = {stats['dijkstra_settled']}, "
+              f"reduction = {stats['reduction']:.0%}, tables = {stats['table_bytes']} bytes")
+
+
+def test_assignment2_balanced_bidirectional():
+    """Test Assignment 2 frontier-balanced bi-directional BFS."""
+    print("\n" + "="*60)
+    print("TEST: Frontier-Balanced Bi-directional BFS (hub start)")
+    print("="*60)
+    
+    # The start is a hub with 200 dead-end spokes; the goal sits at the end
+    # of a quiet chain, so the backward side should do most of the work
+    city = CityGraph()
+    for i in range(200):
+        city.add_edge('HUB', f'S{i}')
+    chain = ['HUB'] + [f'C{i}' for i in range(8)]
+    for u, v in zip(chain, chain[1:]):
+        city.add_edge(u, v)
+    city.add_edge('C7', 'GOAL', bidirectional=False)
+    
+    bfs_path, _ = city.bfs('HUB', 'GOAL')
+    for balance in ('frontier', 'degree'):
+        path, nodes, stats = city.balanced_bidirectional_bfs('HUB', 'GOAL', balance=balance)
+        assert len(path) == len(bfs_path)
+        assert stats['backward']['nodes_expanded'] > stats['forward']['nodes_expanded']
+        print(f"{balance}: path length = {len(path)}, nodes expanded = {nodes}, "
+              f"forward = {stats['forward']}, backward = {stats['backward']}")
+    
+    assert city.balanced_bidirectional_bfs('GOAL', 'HUB')[0] is None
+
+
+def test_assignment2_direction_optimizing_bfs():
+    """Test Assignment 2 direction-optimizing BFS on a dense service area."""
+    print("\n" + "="*60)
+    print("TEST: Direction-Optimizing BFS (dense 400-node graph)")
+    print("="*60)
+    
+    city = CityGraph()
+    for i in range(400):
+        for step in (1, 7, 37, 151):
+            city.add_edge(i, (i * 3 + step) % 400)
+    
+    distance, parent, stats = city.direction_optimizing_bfs(0)
+    assert len(distance) == 400 and parent[0] is None
+    for node in (5, 123, 399):
+        path, _ = city.bfs(0, node)
+        assert distance[node] == len(path) - 1
+        assert distance[parent[node]] == distance[node] - 1
+    
+    # Later searches reuse the CSR copy and its transpose until the graph changes
+    frozen = city._frozen()
+    city.direction_optimizing_bfs(5)
+    assert city._frozen() is frozen and frozen._transpose is not None
+    city.add_edge(0, 200)
+    assert city._frozen() is not frozen
+    
+    assert stats['bottom_up_levels'] > 0
+    assert stats['edges_scanned'] < frozen.num_edges
+    print(f"Levels: top-down = {stats['top_down_levels']}, "
+          f"bottom-up = {stats['bottom_up_levels']}, "
+          f"edges scanned = {stats['edges_scanned']} of {frozen.num_edges}")
+
+
+def test_assignment2_multi_source_bfs():
+    """Test Assignment 2 bit-parallel multi-source BFS from 70 depots."""
+    print("\n" + "="*60)
+    print("TEST: Multi-Source BFS (70 depots, 20x20 street grid)")
+    print("="*60)
+    
+    city = CityGraph()
+    for i in range(20):
+        for j in range(20):
+            if i + 1 < 20:
+                city.add_edge((i, j), (i + 1, j))
+            if j + 1 < 20:
+                city.add_edge((i, j), (i, j + 1))
+    depots = [(i % 20, (i * 7) % 20) for i in range(70)]
+    
+    distance, columns, stats = city.multi_source_bfs(depots)
+    assert len(distance) == len(depots) * len(columns)
+    for row, depot in enumerate(depots[::9]):
+        for col, node in enumerate(columns[::37]):
+            hops = abs(depot[0] - node[0]) + abs(depot[1] - node[1])
+            assert distance[row * 9 * len(columns) + col * 37] == hops
+    
+    frozen = city._frozen()
+    assert city.multi_source_bfs(depots[:5])[1] is columns and city._frozen() is frozen
+    
+    separate_scans = len(depots) * frozen.num_edges
+    assert stats['batches'] == 2
+    assert stats['edges_scanned'] * 4 < separate_scans
+    print(f"Batches: {stats['batches']}, edges scanned = {stats['edges_scanned']} "
+          f"(one BFS per depot: {separate_scans})")
+
+
+def test_assignment2_edge_list_loader():
+    """Test Assignment 2 bulk edge-list loading and binary snapshots."""
+    print("\n" + "="*60)
+    print("TEST: Edge List Loader and Snapshot")
+    print("="*60)
+    
+    expected = create_city_map()
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'roads.csv')
+        with open(csv_path, 'w') as f:
+            f.write("# City roads\nfrom,to,minutes\n")
+            for u, neighbors in expected.graph.items():
+                for v in neighbors:
+                    f.write(f"{u},{v},{expected.weights[(u, v)]}\n")  # Each road twice
+        
+        city = load_edge_list(csv_path, chunk_size=4)
+        assert sorted(city.graph) == sorted(expected.graph)
+        assert city.weights == expected.weights
+        assert all(len(city.graph[node]) == len(set(expected.graph[node])) for node in city.graph)
+        
+        # A row without a destination is reported with its line number
+        with open(csv_path, 'a') as f:
+            f.write("A,B,3\n\nC\n")
+        try:
+            load_edge_list(csv_path, chunk_size=4)
+            assert False, "short row accepted"
+        except ValueError as error:
+            assert f"roads.csv:{3 + len(city.weights) + 2}:" in str(error)
+        
+        # Unweighted lists: a "from,to" header is detected, or set explicitly
+        tsv_path = os.path.join(directory, 'roads.tsv')
+        with open(tsv_path, 'w') as f:
+            f.write("From\tTo\nA\tB\nB\tC\n")
+        assert sorted(load_edge_list(tsv_path).graph) == ['A', 'B', 'C']
+        assert sorted(load_edge_list(tsv_path, header=False).graph) == ['A', 'B', 'C', 'From', 'To']
+        with open(tsv_path, 'w') as f:
+            f.write("street\tcorner\nA\tB\n")
+        assert sorted(load_edge_list(tsv_path, header=True).graph) == ['A', 'B']
+        
+        snapshot_path = os.path.join(directory, 'roads.edges')
+        save_snapshot(city, snapshot_path)
+        restored = load_snapshot(snapshot_path)
+        assert restored.graph == city.graph and restored.weights == city.weights
+        assert restored.bfs('A', 'O') == city.bfs('A', 'O')
+        
+        # Coordinate labels round-trip as tuples; one-way roads stay one-way
+        grid = CityGraph()
+        grid.add_edge((0, 0), (0, 1), bidirectional=False)
+        save_snapshot(grid, snapshot_path)
+        restored = load_snapshot(snapshot_path)
+        assert restored.graph == {(0, 0): [(0, 1)], (0, 1): []} and restored._directed
+        
+        print(f"Loaded {len(city.graph)} nodes, {len(city.weights)} roads; "
+              f"snapshot = {os.path.getsize(snapshot_path)} bytes")
+
+
+def test_assignment2_road_closures():
+    """Test Assignment 2 road closures with the route cache."""
+    print("\n" + "="*60)
+    print("TEST: Road Closures and Route Cache")
+    print("="*60)
+    
+    city = create_city_map()
+    cache = city.enable_route_cache(capacity=3)
+    
+    route, _ = city.bfs('A', 'O')
+    other, _ = city.bfs('A', 'C')
+    assert city.bfs('A', 'O')[0] == route and cache.hits == 1 and cache.misses == 2
+    
+    # Closing a road on the A -> O route invalidates only that answer
+    city.remove_edge(route[1], route[2])
+    assert ('bfs', 'A', 'O') not in cache.entries and ('bfs', 'A', 'C') in cache.entries
+    detour, _ = city.bfs('A', 'O')
+    assert len(detour) >= len(route) and (route[1], route[2]) not in zip(detour, detour[1:])
+    assert city.bfs('A', 'C')[0] == other and cache.hits == 2
+    
+    # Reopening it makes the cached detour stale again
+    city.restore_edge(route[1], route[2])
+    assert city.bfs('A', 'O')[0] == route
+    
+    for end in ('D', 'E', 'F'):
+        city.bidirectional_bfs('A', end)
+    assert len(cache) == 3 and cache.evictions == 2
+
+    # "No route" answers are tracked apart and dropped by any new road
+    assert city.bfs('A', 'Z')[0] is None and ('bfs', 'A', 'Z') in cache.unreachable
+    city.add_edge('O', 'Z')
+    assert not cache.unreachable and city.bfs('A', 'Z')[0][-1] == 'Z'
+    
+    # One-way roads: cached answers track closures in either direction
+    one_way = CityGraph()
+    one_way.add_edge(0, 1, bidirectional=False)
+    one_way.add_edge(1, 2)
+    one_way.add_edge(1, 0, bidirectional=False)
+    one_way.enable_route_cache()
+    for method in ('bfs', 'bidirectional_bfs'):
+        assert getattr(one_way, method)(2, 0)[0] == [2, 1, 0]
+    one_way.remove_edge(0, 1, bidirectional=False)
+    assert one_way.bidirectional_bfs(2, 0) == one_way._bidirectional_bfs(2, 0)
+    one_way.remove_edge(1, 0, bidirectional=False)
+    for method in ('bfs', 'bidirectional_bfs'):
+        assert getattr(one_way, method)(2, 0)[0] is None
+        assert getattr(one_way, method)(0, 2)[0] is None
+    
+    # Predecessor lists are updated in place rather than rebuilt per change
+    predecessors = one_way._predecessors()
+    one_way.restore_edge(1, 0, bidirectional=False)
+    one_way.add_edge(2, 3, bidirectional=False)
+    assert one_way._predecessors() is predecessors
+    assert predecessors[0] == [1] and predecessors[3] == [2]
+    assert one_way.bidirectional_bfs(2, 0)[0] == [2, 1, 0]
+    print(f"Route: {' -> '.join(route)}, detour: {' -> '.join(detour)}")
+    print(f"Hits = {cache.hits}, misses = {cache.misses}, "
+          f"invalidations = {cache.invalidations}, evictions = {cache.evictions}")
+
+
+def test_assignment2_cold_start():
+    """Test that importing the Assignment 2 search core stays within budget."""
+    print("\n" + "="*60)
+    print("TEST: Route Finder Cold-Start Import Budget")
+    print("="*60)
+    
+    budget = 0.25  # Seconds for a fresh interpreter to import the search core
+    probe = ("import sys, time; start = time.perf_counter(); "
+             "import assignment2_route_finder; elapsed = time.perf_counter() - start; "
+             "print(elapsed, 'matplotlib' in sys.modules or 'networkx' in sys.modules)")
+    here = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    for _ in range(3):
+        output = subprocess.run([sys.executable, '-c', probe], cwd=here, check=True,
+                                capture_output=True, text=True).stdout.split()
+        assert output[1] == 'False', "search core imported the plotting stack"
+        runs.append(float(output[0]))
+    
+    assert min(runs) < budget
+    print(f"Import time: best {min(runs) * 1000:.1f} ms of {len(runs)} runs "
+          f"(budget {budget * 1000:.0f} ms)")
+
+
+def test_assignment2_visualization_layout():
+    """Test Assignment 2 cached layouts and path neighbourhoods for drawing."""
+    print("\n" + "="*60)
+    print("TEST: Visualization Layout Cache and Path Neighbourhood")
+    print("="*60)
+    
+    city = create_city_map()
+    layout = graph_layout(city)
+    assert graph_layout(city) is layout  # Reused while the graph is unchanged
+    city.add_edge('O', 'P')
+    assert graph_layout(city) is not layout and 'P' in graph_layout(city)
+    
+    fixed = graph_layout(city, positions={'A': (0.0, 0.0)})
+    assert tuple(fixed['A']) == (0.0, 0.0)
+    
+    # Intersections named by (x, y) are drawn where they are, with no layout step
+    grid = CityGraph()
+    for i in range(60):
+        for j in range(60):
+            if i + 1 < 60:
+                grid.add_edge((i, j), (i + 1, j))
+            if j + 1 < 60:
+                grid.add_edge((i, j), (i, j + 1))
+    assert graph_layout(grid)[(3, 7)] == (3, 7)
+    
+    path, _ = grid.bfs((0, 0), (0, 5))
+    nearby = path_neighbourhood(grid, path, hops=2)
+    assert len(nearby) == 8 + 7 + 6  # x = 0, 1, 2: y up to 7, 6, 5 (clipped at y = 0)
+    
+    # Each road is one segment, even when listed twice or in both directions
+    ring = CityGraph()
+    for u, v in (('A', 'B'), ('B', 'C'), ('A', 'B')):
+        ring.add_edge(u, v)
+    ring.add_edge('C', 'A', bidirectional=False)
+    assert len(road_segments(ring, set(ring.graph), {node: (0, 0) for node in ring.graph})) == 3
+    print(f"Layout nodes: {len(graph_layout(city))}, "
+          f"2-hop neighbourhood: {len(nearby)} of {len(grid.graph)} nodes")
+
+
+def test_assignment2_csr_graph():
+    """Test Assignment 2 searches on the frozen CSR graph."""
+    print("\n" + "="*60)
+    print("TEST: CSR Graph Backend")
+    print("="*60)
+    
+    city = CityGraph()
+    edges = [
+        ('A', 'B'), ('A', 'C'), ('A', 'D'),
+        ('B', 'E'), ('C', 'E'), ('D', 'F'),
+        ('E', 'G'), ('F', 'G'), ('G', 'H'),
+        ('B', 'C'), ('E', 'F'), ('A', 'B')  # Duplicate road
+    ]
+    for u, v in edges:
+        city.add_edge(u, v)
+    
+    frozen = city.freeze()
+    assert frozen.num_edges == 2 * (len(edges) - 1)
+    
+    for method in ('bfs', 'dfs', 'bidirectional_bfs'):
+        assert getattr(frozen, method)('A', 'H') == getattr(city, method)('A', 'H')
+    
+    # With one-way roads the backward side follows roads into each node
+    city.add_edge('H', 'I', bidirectional=False)
+    city.add_edge('I', 'A', bidirectional=False)
+    frozen = city.freeze()
+    for start, end in (('H', 'A'), ('A', 'I'), ('I', 'H')):
+        assert frozen.bidirectional_bfs(start, end) == city.bidirectional_bfs(start, end)
+    assert city.bidirectional_bfs('H', 'A')[0] == ['H', 'I', 'A']
+    
+    print(f"Nodes: {len(frozen)}, adjacency entries: {frozen.num_edges} "
+          f"(CityGraph: {sum(len(n) for n in city.graph.values())})")
+
+
 def test_assignment3_small_grid():
     """Test Assignment 3 with a small grid."""
     print("\n" + "="*60)
@@ -199,6 +965,118 @@ def test_assignment3_obstacles():
         print("No path found (as expected with blocking wall)")
 
 
+def test_assignment3_heuristic_fields():
+    """Test Assignment 3 precomputed heuristic fields."""
+    print("\n" + "="*60)
+    print("TEST: Heuristic Fields (cached, moved treasure, custom)")
+    print("="*60)
+    
+    hunt = TreasureHunt((6, 8), (2, 5), grid=[[1] * 8 for _ in range(6)])
+    for name in ('manhattan', 'euclidean', 'chebyshev', 'octile'):
+        field = hunt.heuristic_field(name)
+        assert hunt.heuristic_field(name) is field
+        assert field[2 * 8 + 5] == 0
+    assert hunt.heuristic_field('manhattan')[0] == 2 + 5
+    assert abs(hunt.heuristic_field('euclidean')[0] - (4 + 25) ** 0.5) < 1e-6
+    assert hunt.heuristic_field('chebyshev')[0] == 5
+    assert abs(hunt.heuristic_field('octile')[0] - (5 + 2 * (2 ** 0.5 - 1))) < 1e-6
+    
+    # Moving the treasure recomputes the fields
+    old_field = hunt.heuristic_field('manhattan')
+    hunt.treasure_pos = (5, 0)
+    assert hunt.heuristic_field('manhattan') is not old_field
+    path, _, _ = hunt.best_first_search((0, 7), 'chebyshev')
+    assert path[0] == (0, 7) and path[-1] == (5, 0)
+    
+    # A custom field: a cost map that prefers the left column
+    hunt.set_heuristic_field('left_first', [[col * 10 + (5 - row) for col in range(8)]
+                                            for row in range(6)])
+    path, nodes, _ = hunt.best_first_search((0, 7), 'left_first')
+    assert path[-1] == (5, 0)
+    
+    # A same-sized grid keeps custom fields; other dimensions drop them
+    hunt.grid = [[1] * 8 for _ in range(6)]
+    assert 'left_first' in hunt.custom_heuristics
+    hunt.grid = [[1] * 6 for _ in range(8)]
+    assert not hunt.custom_heuristics
+    try:
+        hunt.heuristic_field('left_first')
+        assert False, "custom field kept for the old grid"
+    except ValueError:
+        pass
+    print(f"Fields: {len(hunt.heuristic_field('manhattan'))} cells each; "
+          f"custom heuristic path length = {len(path)}, nodes explored = {nodes}")
+
+
+def test_assignment3_priority_queues():
+    """Test Assignment 3 bucket and heap priority queues."""
+    print("\n" + "="*60)
+    print("TEST: Bucket / Heap Priority Queues")
+    print("="*60)
+    
+    entries = [(3, 'a'), (1, 'b'), (3, 'c'), (0, 'd'), (1, 'e'), (2, 'f')]
+    for queue in (BucketQueue(max_key=3), HeapQueue()):
+        for key, item in entries:
+            queue.push(key, item)
+        popped = [queue.pop() for _ in range(len(entries))]
+        # Equal keys come out in insertion order
+        assert popped == [(0, 'd'), (1, 'b'), (1, 'e'), (2, 'f'), (3, 'a'), (3, 'c')]
+        assert len(queue) == 0
+    
+    hunt = TreasureHunt((10, 10), (9, 9), grid=[[1] * 10 for _ in range(10)])
+    assert isinstance(make_priority_queue(hunt.heuristic_field('manhattan')), BucketQueue)
+    assert isinstance(make_priority_queue(hunt.heuristic_field('euclidean')), HeapQueue)
+    
+    # Field bounds are scanned once and follow re-registered custom fields
+    assert hunt.heuristic_bounds('manhattan') == (0, 18)
+    assert hunt._field_bounds['manhattan'][0] is hunt.heuristic_field('manhattan')
+    hunt.set_heuristic_field('flat', [[1] * 10 for _ in range(10)])
+    assert hunt.heuristic_bounds('flat') == (1, 1)
+    hunt.set_heuristic_field('flat', [[-1] * 10 for _ in range(10)])
+    assert hunt.heuristic_bounds('flat') == (-1, -1)
+    assert isinstance(make_priority_queue(hunt.heuristic_field('flat'),
+                                          hunt.heuristic_bounds('flat')), HeapQueue)
+    
+    path, nodes, _ = hunt.best_first_search((0, 0), 'manhattan')
+    assert len(path) == 19 and nodes == 19
+    print(f"Manhattan (bucket queue): path length = {len(path)}, nodes explored = {nodes}")
+
+
+def test_assignment3_search_stats():
+    """Test Assignment 3 streaming search statistics."""
+    print("\n" + "="*60)
+    print("TEST: Streaming Search Statistics")
+    print("="*60)
+    
+    grid = [[1] * 12 for _ in range(12)]
+    for row in range(11):
+        grid[row][6] = 0  # Wall with a gap at the bottom
+    hunt = TreasureHunt((12, 12), (0, 11), grid=grid)
+    
+    # No collector: nothing is recorded
+    path, nodes, stats = hunt.best_first_search((0, 0))
+    assert stats is None
+    
+    trace = TraceStats(bins=4)
+    _, trace_nodes, _ = hunt.best_first_search((0, 0), stats=trace)
+    summary = SearchStats(bins=4)
+    _, _, _ = hunt.best_first_search((0, 0), stats=summary)
+    
+    assert trace_nodes == nodes == summary.count == len(trace.values)
+    assert summary.min == min(trace.values) and summary.max == max(trace.values)
+    assert abs(summary.mean - sum(trace.values) / len(trace.values)) < 1e-9
+    assert sum(summary.histogram) == summary.count and summary.high == 22  # Manhattan from (11, 0)
+    assert summary.peak_open > 1
+    
+    # A custom field sizes the histogram by its own range, not the grid's
+    hunt.set_heuristic_field('scaled', [10 * value for value in hunt.heuristic_field('manhattan')])
+    scaled = SearchStats(bins=4)
+    hunt.best_first_search((0, 0), 'scaled', stats=scaled)
+    assert scaled.high == 220 and scaled.histogram[-1] < scaled.count
+    print(f"Expanded {summary.count}: mean h = {summary.mean:.2f}, min = {summary.min}, "
+          f"max = {summary.max}, histogram = {summary.histogram}, peak open = {summary.peak_open}")
+
+
 def test_all_algorithms():
     """Run all test cases."""
     print("\n" + "="*70)
@@ -210,16 +1088,42 @@ def test_all_algorithms():
     test_assignment1_small_maze()
     test_assignment1_no_solution()
     test_assignment1_large_maze()
+    test_assignment1_compact_grid()
+    test_assignment1_long_corridor()
+    test_assignment1_component_index()
+    test_assignment1_batch_queries()
+    test_assignment1_incremental_replanning()
+    test_assignment1_corridor_graph()
+    test_assignment1_hierarchical()
+    test_assignment1_distance_field()
+    test_assignment1_maze_file()
+    test_assignment1_astar_and_jps()
     
     # Assignment 2 tests
     print("\n### ASSIGNMENT 2 TESTS ###")
     test_assignment2_simple_graph()
     test_assignment2_complex_graph()
+    test_assignment2_deep_graph()
+    test_assignment2_bounded_bfs()
+    test_assignment2_weighted_graph()
+    test_assignment2_contraction_hierarchy()
+    test_assignment2_alt_landmarks()
+    test_assignment2_csr_graph()
+    test_assignment2_balanced_bidirectional()
+    test_assignment2_direction_optimizing_bfs()
+    test_assignment2_multi_source_bfs()
+    test_assignment2_edge_list_loader()
+    test_assignment2_road_closures()
+    test_assignment2_cold_start()
+    test_assignment2_visualization_layout()
     
     # Assignment 3 tests
     print("\n### ASSIGNMENT 3 TESTS ###")
     test_assignment3_small_grid()
     test_assignment3_obstacles()
+    test_assignment3_heuristic_fields()
+    test_assignment3_priority_queues()
+    test_assignment3_search_stats()
     
     print("\n" + "="*70)
     print("ALL TESTS COMPLETED!")